@@ -7,12 +7,24 @@ from ui.folder_selector import render_folder_selector
 from ui.file_preview import render_file_analysis
 from ui.type_selector import render_type_selector, render_process_button
 from ui.progress_tracker import render_processing_interface
-from functions.file_scanner import scan_directory
+from functions.file_scanner import scan_directory, directory_fingerprint
 from functions.encoding_utils import setup_encoding
 
 # Configurar codificação no início da aplicação
 setup_encoding()
 
+# O mtime de uma pasta só muda com alterações diretas nela (não nas subpastas),
+# então o ttl limita por quanto tempo uma alteração mais profunda passa despercebida
+@st.cache_data(show_spinner=False, ttl=300)
+def _cached_scan(directory_path: str, fingerprint: tuple, _top_entries=None):
+    """
+    Escaneia o diretório; a impressão digital da pasta invalida o cache quando ela muda
+    
+    _top_entries (ignorado na chave do cache por começar com '_') é a listagem
+    da raiz já feita pelo seletor de pasta
+    """
+    return scan_directory(directory_path, top_entries=_top_entries)
+
 def main():
     st.set_page_config(
         page_title="Renomeador de Arquivos",
@@ -48,7 +60,12 @@ def main():
         st.header("2. Análise do Diretório")
         
         with st.spinner("Analisando arquivos..."):
-            file_analysis = scan_directory(directory_path)
+            top_entries = st.session_state.get('_top_entries')
+            if top_entries and top_entries[0] == directory_path:
+                top_entries = top_entries[1]
+            else:
+                top_entries = None
+            file_analysis = _cached_scan(directory_path, directory_fingerprint(directory_path), top_entries)
             st.session_state.file_analysis = file_analysis
         
         if file_analysis:
@@ -6,10 +6,21 @@ Compatível com Windows e diferentes codificações
 
 import os
 import sys
+import codecs
 import locale
-from pathlib import Path
+import re
+import unicodedata
 from typing import Optional
 
+# Espaços em branco (agrupados) ou caracteres proibidos no Windows e de controle
+_SANITIZE_RE = re.compile(r'\s+|[<>:"/\\|?*\x00-\x1f]')
+
+# Sequências de espaços em branco
+_MULTISPACE_RE = re.compile(r'\s+')
+
+# Caracteres de controle (inclui quebras de linha)
+_CTRL_RE = re.compile(r'[\x00-\x1f]')
+
 def setup_encoding():
     """
     Configura a codificação adequada para o sistema
@@ -32,6 +43,10 @@ def setup_encoding():
         except locale.Error:
             pass  # Usar locale padrão do sistema
 
+def _sanitize_replacement(match: re.Match) -> str:
+    """Substituição usada por _SANITIZE_RE"""
+    return ' ' if match.group(0)[0].isspace() else '_'
+
 def safe_filename(filename: str, max_length: int = 200) -> str:
     """
     Sanitiza um nome de arquivo para ser seguro em diferentes sistemas
@@ -43,19 +58,12 @@ def safe_filename(filename: str, max_length: int = 200) -> str:
     Returns:
         Nome de arquivo sanitizado
     """
-    # Caracteres proibidos no Windows
-    forbidden_chars = '<>:"/\\|?*'
+    # Unificar caracteres de compatibilidade (dígitos largos, ligaduras, etc.)
+    safe_name = unicodedata.normalize('NFKC', filename)
     
-    # Substituir caracteres proibidos
-    safe_name = filename
-    for char in forbidden_chars:
-        safe_name = safe_name.replace(char, '_')
-    
-    # Remover espaços no início/fim
-    safe_name = safe_name.strip()
-    
-    # Substituir múltiplos espaços por um único
-    safe_name = ' '.join(safe_name.split())
+    # Em uma única passada: espaços múltiplos viram um só e caracteres
+    # proibidos viram '_'; depois remover espaços no início/fim
+    safe_name = _SANITIZE_RE.sub(_sanitize_replacement, safe_name).strip()
     
     # Limitar comprimento
     if len(safe_name) > max_length:
@@ -73,49 +81,110 @@ def safe_filename(filename: str, max_length: int = 200) -> str:
 def safe_path_join(*paths) -> str:
     """
     Junta caminhos de forma segura, tratando diferentes separadores
+    
+    Usa os.path.join, que produz o mesmo resultado que str(Path(*paths)) para
+    caminhos já normalizados sem o custo de construir um objeto Path
     """
-    return str(Path(*paths))
+    return os.path.join(*paths)
 
 def normalize_text(text: str) -> str:
     """
     Normaliza texto removendo caracteres especiais e acentos se necessário
     """
-    # Manter acentos mas remover caracteres de controle
-    normalized = ''.join(char for char in text if ord(char) >= 32)
+    # Unificar caracteres de compatibilidade (dígitos largos, ligaduras, etc.)
+    normalized = unicodedata.normalize('NFKC', text)
     
-    # Substituir quebras de linha por espaços
-    normalized = normalized.replace('\n', ' ').replace('\r', ' ')
+    # Manter acentos mas remover caracteres de controle
+    normalized = _CTRL_RE.sub('', normalized)
     
     # Remover espaços múltiplos
-    normalized = ' '.join(normalized.split())
+    normalized = _MULTISPACE_RE.sub(' ', normalized).strip()
     
     return normalized
 
-def detect_encoding(file_path: str) -> str:
+# Quantidade de bytes analisada para detectar a codificação
+ENCODING_SNIFF_BYTES = 4096
+
+# Bytes 0x80-0x9F: caracteres imprimíveis em cp1252, controles em latin-1
+_C1_BYTES_RE = re.compile(b'[\x80-\x9f]')
+
+# Detector de codificação opcional (cchardet é o mais rápido)
+try:
+    import cchardet as _charset_detector
+except ImportError:
+    try:
+        import charset_normalizer as _charset_detector
+    except ImportError:
+        _charset_detector = None
+
+def _read_prefix(file_path: str, nbytes: int = 8192) -> bytes:
     """
-    Detecta a codificação de um arquivo de texto
+    Lê apenas os primeiros bytes de um arquivo, em uma única leitura
     """
-    encodings_to_try = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-    
-    for encoding in encodings_to_try:
+    with open(file_path, 'rb') as f:
+        return f.read(nbytes)
+
+def _decode_prefix(raw: bytes, encoding: str) -> str:
+    """
+    Decodifica um prefixo de arquivo de forma estrita, tolerando apenas um
+    caractere multibyte cortado no final do prefixo
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    return decoder.decode(raw, final=False)
+
+def _detect_encoding_from_bytes(raw: bytes) -> str:
+    """
+    Detecta a codificação a partir de um prefixo já lido do arquivo
+    """
+    # UTF-8 estrito primeiro: é o caso mais comum e a verificação é exata
+    try:
+        _decode_prefix(raw, 'utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    
+    if _charset_detector is not None:
+        guess = _charset_detector.detect(raw) or {}
+        encoding = guess.get('encoding')
+        if encoding:
+            try:
+                _decode_prefix(raw, encoding)
+                return encoding.lower()
+            except (UnicodeDecodeError, LookupError):
+                pass
+    
+    # latin-1 aceita qualquer byte, então precisa ser a última tentativa;
+    # bytes 0x80-0x9F indicam texto do Windows (cp1252)
+    if _C1_BYTES_RE.search(raw):
         try:
-            with open(file_path, 'r', encoding=encoding) as f:
-                f.read()
-            return encoding
-        except (UnicodeDecodeError, UnicodeError):
-            continue
+            _decode_prefix(raw, 'cp1252')
+            return 'cp1252'
+        except UnicodeDecodeError:
+            pass
     
-    return 'utf-8'  # Fallback
+    return 'latin-1'
+
+def detect_encoding(file_path: str) -> str:
+    """
+    Detecta a codificação de um arquivo de texto usando apenas o início do arquivo
+    """
+    try:
+        raw = _read_prefix(file_path, ENCODING_SNIFF_BYTES)
+    except OSError:
+        return 'utf-8'  # Fallback
+    
+    return _detect_encoding_from_bytes(raw)
 
 def read_text_file(file_path: str, max_chars: int = 1000) -> Optional[str]:
     """
     Lê arquivo de texto de forma segura, tentando diferentes codificações
     """
-    encoding = detect_encoding(file_path)
-    
     try:
-        with open(file_path, 'r', encoding=encoding, errors='replace') as f:
-            content = f.read(max_chars)
-        return normalize_text(content)
+        # Uma única leitura: nenhuma codificação usa mais de 4 bytes por caractere
+        raw = _read_prefix(file_path, max(ENCODING_SNIFF_BYTES, max_chars * 4))
     except Exception:
-        return None
\ No newline at end of file
+        return None
+    
+    # Detecção e decodificação feitas em memória, sem reabrir o arquivo
+    encoding = _detect_encoding_from_bytes(raw)
+    return normalize_text(raw.decode(encoding, errors='replace')[:max_chars])
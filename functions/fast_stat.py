@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Consulta rápida do tipo de um caminho
+No Linux usa statx com AT_STATX_DONT_SYNC (dados em cache do kernel, sem
+sincronizar com servidores de rede) pedindo apenas o tipo; nos demais
+sistemas usa os.stat
+"""
+
+import os
+import sys
+import ctypes
+from typing import NamedTuple, Optional
+
+# Constantes de <fcntl.h> / <linux/stat.h>
+_AT_FDCWD = -100
+_AT_STATX_DONT_SYNC = 0x4000
+_STATX_TYPE = 0x0001
+
+class _StatxTimestamp(ctypes.Structure):
+    _fields_ = [
+        ('tv_sec', ctypes.c_int64),
+        ('tv_nsec', ctypes.c_uint32),
+        ('__reserved', ctypes.c_int32)
+    ]
+
+class _Statx(ctypes.Structure):
+    """struct statx (256 bytes); só stx_mode é lido"""
+    _fields_ = [
+        ('stx_mask', ctypes.c_uint32),
+        ('stx_blksize', ctypes.c_uint32),
+        ('stx_attributes', ctypes.c_uint64),
+        ('stx_nlink', ctypes.c_uint32),
+        ('stx_uid', ctypes.c_uint32),
+        ('stx_gid', ctypes.c_uint32),
+        ('stx_mode', ctypes.c_uint16),
+        ('__spare0', ctypes.c_uint16),
+        ('stx_ino', ctypes.c_uint64),
+        ('stx_size', ctypes.c_uint64),
+        ('stx_blocks', ctypes.c_uint64),
+        ('stx_attributes_mask', ctypes.c_uint64),
+        ('stx_atime', _StatxTimestamp),
+        ('stx_btime', _StatxTimestamp),
+        ('stx_ctime', _StatxTimestamp),
+        ('stx_mtime', _StatxTimestamp),
+        ('stx_rdev_major', ctypes.c_uint32),
+        ('stx_rdev_minor', ctypes.c_uint32),
+        ('stx_dev_major', ctypes.c_uint32),
+        ('stx_dev_minor', ctypes.c_uint32),
+        ('__spare2', ctypes.c_uint64 * 14)
+    ]
+
+class FastStat(NamedTuple):
+    """Resultado de fast_stat; compatível com os.stat_result no campo st_mode"""
+    st_mode: int
+
+def _load_statx():
+    """Função statx da libc (glibc 2.28+), ou None se não existir"""
+    if not sys.platform.startswith('linux'):
+        return None
+    
+    try:
+        libc = ctypes.CDLL(None)
+        statx = libc.statx
+    except (OSError, AttributeError):
+        return None
+    
+    statx.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int,
+                      ctypes.c_uint, ctypes.POINTER(_Statx)]
+    statx.restype = ctypes.c_int
+    return statx
+
+_statx = _load_statx()
+
+def fast_stat(path: str) -> Optional[FastStat]:
+    """
+    Retorna o tipo (st_mode) do caminho, seguindo links simbólicos
+    
+    Returns:
+        FastStat, ou None se o caminho não existir ou não puder ser consultado
+    """
+    if _statx is not None:
+        buffer = _Statx()
+        result = _statx(_AT_FDCWD, os.fsencode(path), _AT_STATX_DONT_SYNC,
+                        _STATX_TYPE, ctypes.byref(buffer))
+        if result == 0 and buffer.stx_mask & _STATX_TYPE:
+            return FastStat(buffer.stx_mode)
+        # Qualquer falha (kernel sem statx, seccomp com EPERM, caminho inexistente)
+        # é confirmada por os.stat: uma chamada a mais, só no caminho de erro
+    
+    try:
+        return FastStat(os.stat(path).st_mode)
+    except (OSError, ValueError):
+        return None
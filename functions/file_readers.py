@@ -5,49 +5,102 @@ Cada leitor extrai conteúdo relevante para gerar nomes de arquivo
 """
 
 import os
+import sys
+import csv
+import itertools
+import functools
+import hashlib
+import importlib
+import importlib.util
+import multiprocessing
+import threading
+import time
+import zipfile
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Iterable, Iterator, List, Tuple
+from xml.sax.saxutils import unescape as xml_unescape
+import xml.etree.ElementTree as ET
 import re
 
-# Importações condicionais para evitar erros se alguma biblioteca não estiver instalada
-try:
-    from docx import Document
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
-
-try:
-    import openpyxl
-    OPENPYXL_AVAILABLE = True
-except ImportError:
-    OPENPYXL_AVAILABLE = False
-
-try:
-    from pptx import Presentation
-    PPTX_AVAILABLE = True
-except ImportError:
-    PPTX_AVAILABLE = False
-
-try:
-    import PyPDF2
-    import pdfplumber
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
-
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-
-try:
-    import xlrd
-    XLRD_AVAILABLE = True
-except ImportError:
-    XLRD_AVAILABLE = False
-
-from .encoding_utils import normalize_text, safe_filename
+# Bibliotecas pesadas são importadas sob demanda, apenas quando um arquivo
+# daquele tipo é lido, em vez de todas no import deste módulo
+@functools.lru_cache(maxsize=None)
+def _import_optional(module_name: str):
+    """Importa um módulo opcional, retornando None se não estiver instalado"""
+    try:
+        return importlib.import_module(module_name)
+    except ImportError:
+        return None
+
+@functools.lru_cache(maxsize=None)
+def _is_installed(module_name: str) -> bool:
+    """Verifica se um módulo está instalado sem importá-lo"""
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+# Flags de disponibilidade mantidas por compatibilidade (PEP 562): calculadas
+# apenas quando acessadas, sem importar as bibliotecas
+_AVAILABILITY_FLAGS = {
+    'DOCX_AVAILABLE': ('docx',),
+    'OPENPYXL_AVAILABLE': ('openpyxl',),
+    'PPTX_AVAILABLE': ('pptx',),
+    'PYMUPDF_AVAILABLE': ('fitz',),
+    'PDFIUM_AVAILABLE': ('pypdfium2',),
+    'PDF_AVAILABLE': ('PyPDF2', 'pdfplumber'),
+    'PANDAS_AVAILABLE': ('pandas',),
+    'XLRD_AVAILABLE': ('xlrd',)
+}
+
+def __getattr__(name: str):
+    modules = _AVAILABILITY_FLAGS.get(name)
+    if modules is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return all(_is_installed(module) for module in modules)
+
+from .encoding_utils import normalize_text, safe_filename, detect_encoding
+
+# Nomes de planilha padrão que não servem como título
+_GENERIC_SHEET_NAMES = ('sheet1', 'planilha1', 'plan1')
+
+# Primeira entrada <sheet name="..."> do xl/workbook.xml (ordem das abas)
+_XLSX_SHEET_NAME_RE = re.compile(br'<(?:\w+:)?sheet\b[^>]*?\sname="([^"]*)"')
+
+# Elementos do XML de documentos Word (.docx)
+_WORDML_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_DOCX_P = _WORDML_NS + 'p'
+_DOCX_T = _WORDML_NS + 't'
+_DC_TITLE = '{http://purl.org/dc/elements/1.1/}title'
+
+# Profundidade dos parágrafos de primeiro nível: w:document > w:body > w:p
+_DOCX_BODY_CHILD_DEPTH = 3
+
+# Elementos de texto do XML de slides (.pptx)
+_DRAWINGML_NS = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+_PRESENTATIONML_NS = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+_PPTX_TXBODY = _PRESENTATIONML_NS + 'txBody'
+_DRAWINGML_P = _DRAWINGML_NS + 'p'
+_DRAWINGML_T = _DRAWINGML_NS + 't'
+
+# Abaixo disso o texto extraído de um PDF é considerado insuficiente
+# (PDF escaneado ou falha do leitor) e o próximo leitor é tentado
+_MIN_PDF_TEXT_CHARS = 20
+
+# Diferença vertical (pt) a partir da qual dois caracteres ficam em linhas diferentes
+_PDF_LINE_TOLERANCE = 2
+
+# Distância horizontal (pt) entre caracteres tratada como espaço entre palavras
+_PDF_SPACE_GAP = 2
+
+# Serializa as bibliotecas de PDF nativas (PyMuPDF, PDFium), que não suportam
+# uso simultâneo por várias threads; com processos cada um tem o seu lock,
+# por isso a estratégia 'auto' usa processos para lotes grandes com PDFs
+_NATIVE_PDF_LOCK = threading.Lock()
+
+# Primeira linha com mais de 3 caracteres após remover espaços nas pontas
+_PDF_TITLE_RE = re.compile(r'^[^\S\n]*(\S[^\n]{2,}\S)[^\S\n]*$', re.MULTILINE)
 
 class FileReader:
     """Classe base para leitores de arquivo"""
@@ -65,67 +118,168 @@ class FileReader:
                 'title': str,           # Título/nome sugerido
                 'content_preview': str, # Preview do conteúdo
                 'success': bool,        # Se a leitura foi bem-sucedida
-                'error': str,          # Mensagem de erro se houver
-                'suggested_name': str   # Nome de arquivo sugerido
+                'error': str           # Mensagem de erro se houver
             }
         """
         try:
-            result = self._extract_content(file_path)
-            if result['success']:
-                result['suggested_name'] = self._generate_filename(result['title'], file_path)
-            return result
+            return self._extract_content(file_path)
         except Exception as e:
             return {
                 'title': '',
                 'content_preview': '',
                 'success': False,
-                'error': f"Erro ao ler arquivo: {str(e)}",
-                'suggested_name': ''
+                'error': f"Erro ao ler arquivo: {str(e)}"
             }
     
+    def is_available(self) -> bool:
+        """Indica se as bibliotecas necessárias para este leitor estão instaladas"""
+        return True
+    
     def _extract_content(self, file_path: str) -> Dict[str, Any]:
         """Método a ser implementado pelas subclasses"""
         raise NotImplementedError
-    
-    def _generate_filename(self, title: str, original_path: str) -> str:
-        """Gera nome de arquivo baseado no título extraído - apenas para compatibilidade"""
-        # Este método não é mais usado, pois a geração de nomes foi movida para FileRenamer
-        return Path(original_path).name
 
 class WordReader(FileReader):
     """Leitor para arquivos Word (.docx)"""
     
     def _extract_content(self, file_path: str) -> Dict[str, Any]:
-        if not DOCX_AVAILABLE:
+        # Caminho rápido: ler só o início do XML do corpo, sem python-docx
+        try:
+            parts = self._read_document_xml(file_path)
+        except Exception as e:
             return {
                 'title': '',
                 'content_preview': '',
                 'success': False,
-                'error': 'Biblioteca python-docx não disponível'
+                'error': f"Erro ao ler Word: {str(e)}"
             }
         
+        if parts is None:
+            return self._extract_with_python_docx(file_path)
+        
+        title, content_parts = parts
+        content_preview = ' '.join(content_parts)[:self.max_content_chars]
+        
+        return {
+            'title': title or "documento_word",
+            'content_preview': content_preview,
+            'success': True,
+            'error': ''
+        }
+    
+    def _read_document_xml(self, file_path: str) -> Optional[Tuple[str, List[str]]]:
+        """
+        Lê o título (docProps/core.xml) e os primeiros parágrafos de
+        word/document.xml direto do zip, processando o XML de forma incremental
+        e parando assim que o preview estiver completo
+        
+        Returns:
+            (título, textos dos parágrafos), ou None se as partes não estiverem
+            nos caminhos padrão (nesse caso o python-docx é usado)
+        """
         try:
-            doc = Document(file_path)
+            archive = zipfile.ZipFile(file_path)
+        except zipfile.BadZipFile:
+            return None
+        
+        with archive:
+            names = set(archive.namelist())
+            if 'word/document.xml' not in names:
+                return None
             
-            # Tentar extrair título de várias formas
+            # 1. Verificar propriedades do documento (arquivo pequeno e opcional)
             title = ""
-            content_parts = []
+            if 'docProps/core.xml' in names:
+                try:
+                    core_title = ET.fromstring(archive.read('docProps/core.xml')).find(_DC_TITLE)
+                    if core_title is not None and core_title.text:
+                        title = core_title.text.strip()
+                except ET.ParseError:
+                    pass
             
-            # 1. Verificar propriedades do documento
-            if hasattr(doc.core_properties, 'title') and doc.core_properties.title:
-                title = doc.core_properties.title
+            # 2. Percorrer o corpo sob demanda: só os parágrafos de primeiro nível
+            with archive.open('word/document.xml') as xml_file:
+                return self._summarize_paragraphs(self._iter_body_paragraphs(xml_file), title)
+    
+    def _iter_body_paragraphs(self, xml_file) -> Iterator[str]:
+        """Gera o texto dos parágrafos de primeiro nível do corpo, à medida que o XML é lido"""
+        depth = 0
+        for event, elem in ET.iterparse(xml_file, events=('start', 'end')):
+            if event == 'start':
+                depth += 1
+                continue
             
-            # 2. Se não tem título, usar primeiro parágrafo
-            if not title and doc.paragraphs:
-                first_paragraph = doc.paragraphs[0].text.strip()
-                if first_paragraph:
-                    title = first_paragraph
+            depth -= 1
+            if depth != _DOCX_BODY_CHILD_DEPTH - 1:
+                continue
             
-            # 3. Coletar conteúdo para preview
-            for paragraph in doc.paragraphs[:5]:  # Primeiros 5 parágrafos
-                text = paragraph.text.strip()
-                if text:
-                    content_parts.append(text)
+            if elem.tag == _DOCX_P:
+                text = ''.join(node.text or '' for node in elem.iter(_DOCX_T)).strip()
+                elem.clear()
+                yield text
+            else:
+                # Descartar o elemento já processado (tabelas etc.)
+                elem.clear()
+    
+    def _summarize_paragraphs(self, paragraph_texts: Iterable[str], title: str) -> Tuple[str, List[str]]:
+        """
+        Percorre os parágrafos uma única vez: o primeiro vira título (se o
+        documento não tiver um) e os primeiros 5 com texto formam o preview
+        
+        Args:
+            paragraph_texts: Textos dos parágrafos, já sem espaços nas pontas
+            title: Título das propriedades do documento, se houver
+        
+        Returns:
+            (título, textos para o preview)
+        """
+        paragraph_texts = iter(paragraph_texts)
+        
+        # Se não tem título, usar primeiro parágrafo
+        first_text = next(paragraph_texts, '')
+        if not title:
+            title = first_text
+        
+        # 3. Coletar conteúdo para preview (primeiros 5 parágrafos com texto)
+        content_parts = []
+        preview_chars = 0
+        non_empty = filter(None, itertools.chain((first_text,), paragraph_texts))
+        for text in itertools.islice(non_empty, 5):
+            content_parts.append(text)
+            preview_chars += len(text) + 1
+            if preview_chars >= self.max_content_chars:
+                break
+        
+        return title, content_parts
+    
+    def _extract_with_python_docx(self, file_path: str) -> Dict[str, Any]:
+        """Leitura com python-docx, que segue os relacionamentos do pacote"""
+        docx = _import_optional('docx')
+        if docx is None:
+            return {
+                'title': '',
+                'content_preview': '',
+                'success': False,
+                'error': 'Biblioteca python-docx não disponível'
+            }
+        
+        try:
+            from docx.oxml.ns import qn
+            
+            doc = docx.Document(file_path)
+            
+            # Tentar extrair título de várias formas
+            # 1. Verificar propriedades do documento (atributo XML, leitura barata)
+            title = doc.core_properties.title or ""
+            
+            # 2. Percorrer o XML do corpo sob demanda: doc.paragraphs materializa
+            # todos os parágrafos do documento, mas só precisamos dos primeiros
+            W_P, W_T = qn('w:p'), qn('w:t')
+            paragraph_texts = (
+                ''.join(node.text or '' for node in paragraph.iter(W_T)).strip()
+                for paragraph in doc.element.body.iterchildren(W_P)
+            )
+            title, content_parts = self._summarize_paragraphs(paragraph_texts, title)
             
             content_preview = ' '.join(content_parts)[:self.max_content_chars]
             
@@ -145,7 +299,12 @@ class WordReader(FileReader):
             }
 
 class ExcelReader(FileReader):
-    """Leitor para arquivos Excel (.xlsx e .xls)"""
+    """
+    Leitor para arquivos Excel (.xlsx e .xls)
+    
+    Sempre disponível: o nome da primeira planilha de um .xlsx é lido direto do
+    zip; openpyxl e xlrd são verificados por extensão, na hora da leitura
+    """
     
     def _extract_content(self, file_path: str) -> Dict[str, Any]:
         file_extension = Path(file_path).suffix.lower()
@@ -167,8 +326,27 @@ class ExcelReader(FileReader):
             }
     
     def _read_xlsx(self, file_path: str) -> Dict[str, Any]:
-        """Lê arquivos .xlsx com openpyxl"""
-        if not OPENPYXL_AVAILABLE:
+        """Lê arquivos .xlsx pelo nome da primeira planilha ou, se necessário, com openpyxl"""
+        # Caminho rápido: se o nome da primeira planilha já é um bom título,
+        # não é preciso carregar a pasta de trabalho com openpyxl
+        sheet_name = self._read_xlsx_first_sheet_name(file_path)
+        if sheet_name and sheet_name.lower() not in _GENERIC_SHEET_NAMES:
+            return {
+                'title': sheet_name,
+                'content_preview': '',
+                'success': True,
+                'error': ''
+            }
+        
+        openpyxl = _import_optional('openpyxl')
+        if openpyxl is None:
+            if sheet_name:
+                return {
+                    'title': sheet_name,
+                    'content_preview': '',
+                    'success': True,
+                    'error': ''
+                }
             return {
                 'title': '',
                 'content_preview': '',
@@ -176,38 +354,36 @@ class ExcelReader(FileReader):
                 'error': 'Biblioteca openpyxl não disponível'
             }
         
+        workbook = None
         try:
-            workbook = openpyxl.load_workbook(file_path, data_only=True)
+            # Modo somente leitura: as linhas são lidas sob demanda, sem carregar a planilha inteira
+            workbook = openpyxl.load_workbook(file_path, data_only=True, read_only=True, keep_links=False)
             
             # Usar nome da primeira planilha como título
             sheet_names = workbook.sheetnames
             title = sheet_names[0] if sheet_names else "planilha"
             
-            # Se o nome é genérico, tentar usar conteúdo da célula A1
-            if title.lower() in ['sheet1', 'planilha1', 'plan1']:
-                try:
-                    first_sheet = workbook.active
-                    cell_a1 = first_sheet['A1'].value
-                    if cell_a1 and isinstance(cell_a1, str):
-                        title = str(cell_a1).strip()
-                except:
-                    pass
-            
-            # Coletar preview do conteúdo
-            content_parts = []
+            # Ler a janela de preview uma única vez: primeiras 5 linhas, primeiras 3 colunas
+            rows = []
             try:
                 sheet = workbook.active
-                for row in range(1, min(6, sheet.max_row + 1)):  # Primeiras 5 linhas
-                    row_data = []
-                    for col in range(1, min(4, sheet.max_column + 1)):  # Primeiras 3 colunas
-                        cell_value = sheet.cell(row=row, column=col).value
-                        if cell_value is not None:
-                            row_data.append(str(cell_value))
-                    if row_data:
-                        content_parts.append(' | '.join(row_data))
+                rows = list(sheet.iter_rows(min_row=1, max_row=5, max_col=3, values_only=True))
             except:
                 pass
             
+            # Se o nome é genérico, tentar usar conteúdo da célula A1 (início da janela)
+            if title.lower() in _GENERIC_SHEET_NAMES and rows and rows[0]:
+                cell_a1 = rows[0][0]
+                if cell_a1 and isinstance(cell_a1, str):
+                    title = cell_a1.strip()
+            
+            # Coletar preview do conteúdo
+            content_parts = []
+            for row in rows:
+                row_data = [str(value) for value in row if value is not None]
+                if row_data:
+                    content_parts.append(' | '.join(row_data))
+            
             content_preview = '\n'.join(content_parts)[:self.max_content_chars]
             
             return {
@@ -224,10 +400,29 @@ class ExcelReader(FileReader):
                 'success': False,
                 'error': f"Erro ao ler .xlsx: {str(e)}"
             }
+        finally:
+            # Obrigatório no modo somente leitura para liberar o arquivo zip
+            if workbook is not None:
+                workbook.close()
+    
+    def _read_xlsx_first_sheet_name(self, file_path: str) -> Optional[str]:
+        """Lê o nome da primeira planilha direto do xl/workbook.xml dentro do zip"""
+        try:
+            with zipfile.ZipFile(file_path) as archive:
+                workbook_xml = archive.read('xl/workbook.xml')
+        except (KeyError, OSError, zipfile.BadZipFile):
+            return None
+        
+        match = _XLSX_SHEET_NAME_RE.search(workbook_xml)
+        if not match:
+            return None
+        
+        return xml_unescape(match.group(1).decode('utf-8'), {'&quot;': '"', '&apos;': "'"}).strip() or None
     
     def _read_xls(self, file_path: str) -> Dict[str, Any]:
         """Lê arquivos .xls legados com xlrd"""
-        if not XLRD_AVAILABLE:
+        xlrd = _import_optional('xlrd')
+        if xlrd is None:
             return {
                 'title': '',
                 'content_preview': '',
@@ -301,55 +496,96 @@ class PowerPointReader(FileReader):
     """Leitor para arquivos PowerPoint (.pptx)"""
     
     def _extract_content(self, file_path: str) -> Dict[str, Any]:
-        if not PPTX_AVAILABLE:
-            return {
-                'title': '',
-                'content_preview': '',
-                'success': False,
-                'error': 'Biblioteca python-pptx não disponível'
-            }
+        # Caminho rápido: ler só o XML do primeiro slide, sem python-pptx
+        shape_texts = self._read_first_slide_texts(file_path)
         
-        try:
-            presentation = Presentation(file_path)
-            
-            title = ""
-            content_parts = []
-            
-            # Tentar extrair título do primeiro slide
-            if presentation.slides:
-                first_slide = presentation.slides[0]
-                for shape in first_slide.shapes:
-                    if hasattr(shape, "text") and shape.text.strip():
-                        if not title:
-                            title = shape.text.strip()
-                        content_parts.append(shape.text.strip())
-            
-            # Se não encontrou título, usar "apresentacao"
-            if not title:
-                title = "apresentacao"
-            
-            content_preview = ' '.join(content_parts)[:self.max_content_chars]
-            
-            return {
-                'title': title,
-                'content_preview': content_preview,
-                'success': True,
-                'error': ''
-            }
+        if shape_texts is None:
+            pptx = _import_optional('pptx')
+            if pptx is None:
+                return {
+                    'title': '',
+                    'content_preview': '',
+                    'success': False,
+                    'error': 'Biblioteca python-pptx não disponível'
+                }
             
-        except Exception as e:
-            return {
-                'title': '',
-                'content_preview': '',
-                'success': False,
-                'error': f"Erro ao ler PowerPoint: {str(e)}"
-            }
+            try:
+                presentation = pptx.Presentation(file_path)
+                
+                shape_texts = []
+                
+                # Tentar extrair título do primeiro slide
+                if presentation.slides:
+                    first_slide = presentation.slides[0]
+                    for shape in first_slide.shapes:
+                        if hasattr(shape, "text") and shape.text.strip():
+                            shape_texts.append(shape.text.strip())
+                
+            except Exception as e:
+                return {
+                    'title': '',
+                    'content_preview': '',
+                    'success': False,
+                    'error': f"Erro ao ler PowerPoint: {str(e)}"
+                }
+        
+        # Se não encontrou título, usar "apresentacao"
+        title = shape_texts[0] if shape_texts else "apresentacao"
+        
+        content_preview = ' '.join(shape_texts)[:self.max_content_chars]
+        
+        return {
+            'title': title,
+            'content_preview': content_preview,
+            'success': True,
+            'error': ''
+        }
+    
+    def _read_first_slide_texts(self, file_path: str) -> Optional[List[str]]:
+        """
+        Extrai o texto de cada forma do primeiro slide direto do zip
+        
+        Returns:
+            Textos das formas na ordem do slide, ou None se ppt/slides/slide1.xml
+            não puder ser lido (nesse caso o python-pptx é usado)
+        """
+        shape_texts = []
+        preview_chars = 0
+        try:
+            with zipfile.ZipFile(file_path) as archive, \
+                    archive.open('ppt/slides/slide1.xml') as xml_file:
+                # Processar cada caixa de texto assim que ela termina e parar
+                # quando o preview estiver completo
+                for _, text_body in ET.iterparse(xml_file):
+                    if text_body.tag != _PPTX_TXBODY:
+                        continue
+                    
+                    # Mesmo formato de shape.text: parágrafos separados por quebra de linha
+                    paragraphs = (
+                        ''.join(node.text or '' for node in paragraph.iter(_DRAWINGML_T))
+                        for paragraph in text_body.iter(_DRAWINGML_P)
+                    )
+                    text = '\n'.join(paragraphs).strip()
+                    text_body.clear()
+                    
+                    if text:
+                        shape_texts.append(text)
+                        preview_chars += len(text) + 1
+                        if preview_chars >= self.max_content_chars:
+                            break
+        except (KeyError, OSError, zipfile.BadZipFile, ET.ParseError):
+            return None
+        
+        return shape_texts
 
 class PDFReader(FileReader):
     """Leitor para arquivos PDF"""
     
+    def is_available(self) -> bool:
+        return any(_is_installed(module) for module in ('fitz', 'pypdfium2', 'PyPDF2', 'pdfplumber'))
+    
     def _extract_content(self, file_path: str) -> Dict[str, Any]:
-        if not PDF_AVAILABLE:
+        if not self.is_available():
             return {
                 'title': '',
                 'content_preview': '',
@@ -357,47 +593,19 @@ class PDFReader(FileReader):
                 'error': 'Bibliotecas PDF não disponíveis'
             }
         
-        title = ""
-        content_preview = ""
+        # Do leitor mais rápido para o mais lento: o próximo só é usado se o
+        # anterior não estiver instalado ou não extrair texto suficiente
+        text = ""
+        for read_first_page in (self._read_with_pymupdf, self._read_with_pdfium,
+                                self._read_with_pypdf2, self._read_with_pdfplumber):
+            page_text = read_first_page(file_path)
+            if len(page_text.strip()) > len(text.strip()):
+                text = page_text
+            if len(text.strip()) >= _MIN_PDF_TEXT_CHARS:
+                break
         
-        # Tentar primeiro com pdfplumber (melhor para texto)
-        try:
-            import pdfplumber
-            with pdfplumber.open(file_path) as pdf:
-                if pdf.pages:
-                    first_page = pdf.pages[0]
-                    text = first_page.extract_text()
-                    if text:
-                        lines = text.split('\n')
-                        # Usar primeira linha não vazia como título
-                        for line in lines:
-                            line = line.strip()
-                            if line and len(line) > 3:
-                                title = line
-                                break
-                        content_preview = text[:self.max_content_chars]
-        except:
-            pass
-        
-        # Se pdfplumber falhou, tentar PyPDF2
-        if not title:
-            try:
-                import PyPDF2
-                with open(file_path, 'rb') as file:
-                    reader = PyPDF2.PdfReader(file)
-                    if reader.pages:
-                        page = reader.pages[0]
-                        text = page.extract_text()
-                        if text:
-                            lines = text.split('\n')
-                            for line in lines:
-                                line = line.strip()
-                                if line and len(line) > 3:
-                                    title = line
-                                    break
-                            content_preview = text[:self.max_content_chars]
-            except:
-                pass
+        title = self._title_from_text(text)
+        content_preview = text[:self.max_content_chars]
         
         return {
             'title': title or "documento_pdf",
@@ -405,55 +613,145 @@ class PDFReader(FileReader):
             'success': bool(title or content_preview),
             'error': '' if (title or content_preview) else 'Não foi possível extrair texto do PDF'
         }
+    
+    def _read_with_pymupdf(self, file_path: str) -> str:
+        """Extrai texto da primeira página com PyMuPDF, parando ao atingir o limite do preview"""
+        fitz = _import_optional('fitz')  # PyMuPDF
+        if fitz is None:
+            return ""
+        
+        # PyMuPDF não é thread-safe: uma leitura por vez quando o pool usa threads
+        with _NATIVE_PDF_LOCK:
+            try:
+                with fitz.open(file_path) as doc:
+                    if doc.page_count == 0:
+                        return ""
+                    page = doc[0]
+                    parts = []
+                    total_chars = 0
+                    # Blocos vêm na ordem de leitura; não é preciso extrair a página inteira
+                    for block in page.get_text("blocks", flags=fitz.TEXT_PRESERVE_WHITESPACE):
+                        block_text = block[4]
+                        parts.append(block_text)
+                        total_chars += len(block_text)
+                        if total_chars >= self.max_content_chars:
+                            break
+                    return ''.join(parts)
+            except Exception:
+                return ""
+    
+    def _read_with_pdfium(self, file_path: str) -> str:
+        """Extrai texto da primeira página com pypdfium2 (PDFium, o motor do Chromium)"""
+        pdfium = _import_optional('pypdfium2')
+        if pdfium is None:
+            return ""
+        
+        # PDFium também não é thread-safe
+        with _NATIVE_PDF_LOCK:
+            pdf = page = textpage = None
+            try:
+                pdf = pdfium.PdfDocument(file_path)
+                if len(pdf) == 0:
+                    return ""
+                page = pdf[0]
+                textpage = page.get_textpage()
+                return textpage.get_text_range() or ""
+            except Exception:
+                return ""
+            finally:
+                # Liberar os objetos nativos na ordem inversa da criação
+                for handle in (textpage, page, pdf):
+                    if handle is not None:
+                        handle.close()
+    
+    def _read_with_pypdf2(self, file_path: str) -> str:
+        """Extrai texto da primeira página com PyPDF2, sem processar as demais"""
+        PyPDF2 = _import_optional('PyPDF2')
+        if PyPDF2 is None:
+            return ""
+        
+        try:
+            with open(file_path, 'rb') as file:
+                reader = PyPDF2.PdfReader(file, strict=False)
+                if not reader.pages:
+                    return ""
+                return reader.pages[0].extract_text() or ""
+        except Exception:
+            return ""
+    
+    def _read_with_pdfplumber(self, file_path: str) -> str:
+        """Extrai texto da primeira página com pdfplumber (mais lento, melhor em layouts complexos)"""
+        pdfplumber = _import_optional('pdfplumber')
+        if pdfplumber is None:
+            return ""
+        
+        try:
+            # pages=[1] evita construir objetos para as outras páginas
+            with pdfplumber.open(file_path, pages=[1]) as pdf:
+                if not pdf.pages:
+                    return ""
+                page = pdf.pages[0]
+                text = self._text_from_chars(page.chars)
+                if text:
+                    return text
+                # Sem caracteres soltos: extração simples, sem agrupamento por layout
+                return page.extract_text(layout=False) or ""
+        except Exception:
+            return ""
+    
+    def _text_from_chars(self, chars: List[Dict[str, Any]]) -> str:
+        """
+        Monta as linhas diretamente dos caracteres do pdfplumber, sem a análise
+        de layout do extract_text: uma nova linha começa quando a coordenada
+        vertical muda. Para ao atingir o limite do preview
+        """
+        lines = []
+        current = []
+        total_chars = 0
+        last_top = None
+        last_x1 = None
+        
+        for char in chars:
+            top = round(char.get('top', 0))
+            if last_top is not None and abs(top - last_top) > _PDF_LINE_TOLERANCE:
+                line = ''.join(current)
+                lines.append(line)
+                total_chars += len(line) + 1
+                if total_chars >= self.max_content_chars:
+                    current = []
+                    break
+                current = []
+                last_x1 = None
+            elif last_x1 is not None and char.get('x0', 0) - last_x1 > _PDF_SPACE_GAP:
+                # Espaço implícito entre palavras (não há caractere de espaço no PDF)
+                current.append(' ')
+            
+            current.append(char.get('text', ''))
+            last_top = top
+            last_x1 = char.get('x1', 0)
+        
+        if current:
+            lines.append(''.join(current))
+        
+        return '\n'.join(lines)
+    
+    def _title_from_text(self, text: str) -> str:
+        """Usa a primeira linha não vazia (mais de 3 caracteres) como título"""
+        match = _PDF_TITLE_RE.search(text)
+        return match.group(1) if match else ""
 
 class CSVReader(FileReader):
     """Leitor para arquivos CSV"""
     
     def _extract_content(self, file_path: str) -> Dict[str, Any]:
-        if not PANDAS_AVAILABLE:
-            return {
-                'title': '',
-                'content_preview': '',
-                'success': False,
-                'error': 'Biblioteca pandas não disponível'
-            }
-        
         try:
-            # Tentar diferentes codificações
-            encodings = ['utf-8', 'latin-1', 'cp1252']
-            df = None
-            
-            for encoding in encodings:
-                try:
-                    df = pd.read_csv(file_path, encoding=encoding, nrows=5)
-                    break
-                except:
-                    continue
-            
-            if df is None:
-                return {
-                    'title': '',
-                    'content_preview': '',
-                    'success': False,
-                    'error': 'Não foi possível ler o arquivo CSV'
-                }
+            encoding = detect_encoding(file_path)
             
-            # Usar nome das colunas como base do título
-            columns = list(df.columns)
-            if columns:
-                title = '_'.join(columns[:3])  # Primeiras 3 colunas
-            else:
-                title = "dados_csv"
-            
-            # Preview do conteúdo
-            content_preview = df.head().to_string()[:self.max_content_chars]
-            
-            return {
-                'title': title,
-                'content_preview': content_preview,
-                'success': True,
-                'error': ''
-            }
+            # Só precisamos do cabeçalho e das primeiras linhas: o módulo csv basta
+            with open(file_path, 'r', encoding=encoding, errors='replace', newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, [])
+                rows = list(itertools.islice(reader, 5))
             
         except Exception as e:
             return {
@@ -462,17 +760,291 @@ class CSVReader(FileReader):
                 'success': False,
                 'error': f"Erro ao ler CSV: {str(e)}"
             }
+        
+        # Usar nome das colunas como base do título
+        title = '_'.join(header[:3]) or "dados_csv"  # Primeiras 3 colunas
+        
+        # Preview do conteúdo
+        content_preview = '\n'.join(' | '.join(row) for row in [header, *rows])[:self.max_content_chars]
+        
+        return {
+            'title': title,
+            'content_preview': content_preview,
+            'success': True,
+            'error': ''
+        }
 
 # Factory para criar leitores
+_READER_CLASSES = {
+    'word': WordReader,
+    'excel': ExcelReader,
+    'powerpoint': PowerPointReader,
+    'pdf': PDFReader,
+    'csv': CSVReader
+}
+
+@functools.lru_cache(maxsize=None)
+def _make_reader(file_type: str) -> Optional[FileReader]:
+    """
+    Cria o leitor de um tipo; como leitores não guardam estado entre arquivos,
+    o cache faz com que cada processo tenha uma única instância por tipo
+    """
+    reader_class = _READER_CLASSES.get(file_type)
+    return reader_class() if reader_class else None
+
 def get_file_reader(file_type: str) -> Optional[FileReader]:
-    """Retorna o leitor apropriado para o tipo de arquivo"""
-    readers = {
-        'word': WordReader,
-        'excel': ExcelReader,
-        'powerpoint': PowerPointReader,
-        'pdf': PDFReader,
-        'csv': CSVReader
-    }
-    
-    reader_class = readers.get(file_type)
-    return reader_class() if reader_class else None
\ No newline at end of file
+    """
+    Retorna o leitor apropriado para o tipo de arquivo, ou None se o tipo
+    não for suportado ou as bibliotecas do leitor não estiverem instaladas
+    """
+    reader = _make_reader(file_type)
+    return reader if reader and reader.is_available() else None
+
+# Cache de leituras entre reruns do Streamlit: (caminho, mtime, tipo) -> resultado
+_read_cache: Dict[Tuple[str, float, str], Dict[str, Any]] = {}
+_READ_CACHE_MAX_ENTRIES = 5000
+
+def _read_cache_key(file_path: str, file_type: str,
+                    file_stat: Optional[os.stat_result]) -> Optional[Tuple[str, float, str]]:
+    """Monta a chave do cache; o mtime invalida a entrada quando o arquivo muda"""
+    if file_stat is None:
+        return None
+    return (file_path, file_stat.st_mtime, file_type)
+
+# Bytes iniciais usados na impressão digital de arquivos duplicados
+_FINGERPRINT_BYTES = 64 * 1024
+
+def _content_digest(file_path: str) -> Optional[str]:
+    """SHA-256 do início do arquivo, ou None se não puder ser lido"""
+    try:
+        with open(file_path, 'rb') as f:
+            return hashlib.sha256(f.read(_FINGERPRINT_BYTES)).hexdigest()
+    except OSError:
+        return None
+
+def _group_duplicates(pending: List[Tuple[int, Any, Tuple[str, str], int]]) -> Dict[int, List[int]]:
+    """
+    Agrupa arquivos do lote com o mesmo conteúdo: (tipo, tamanho, SHA-256 dos
+    primeiros 64 KB). Só arquivos com tamanho repetido são lidos para o hash
+    
+    Returns:
+        Posição em pending do primeiro arquivo de cada grupo -> posições das cópias
+    """
+    by_size: Dict[Tuple[str, int], List[int]] = {}
+    for position, (_, _, item, size) in enumerate(pending):
+        if size >= 0:
+            by_size.setdefault((item[1], size), []).append(position)
+    
+    duplicates: Dict[int, List[int]] = {}
+    for positions in by_size.values():
+        if len(positions) < 2:
+            continue
+        
+        first_by_digest: Dict[str, int] = {}
+        for position in positions:
+            digest = _content_digest(pending[position][2][0])
+            if digest is None:
+                continue
+            first = first_by_digest.setdefault(digest, position)
+            if first != position:
+                duplicates.setdefault(first, []).append(position)
+    
+    return duplicates
+
+def _read_worker(item: Tuple[str, str]) -> Dict[str, Any]:
+    """Lê um único arquivo; executado dentro dos processos do pool"""
+    file_path, file_type = item
+    
+    # O leitor é criado dentro do worker: Document/Presentation não são serializáveis
+    reader = get_file_reader(file_type)
+    if not reader:
+        return {
+            'path': file_path,
+            'result': None,
+            'error': f'Leitor não disponível para tipo {file_type}'
+        }
+    
+    try:
+        return {'path': file_path, 'result': reader.read_file(file_path), 'error': ''}
+    except Exception as e:
+        return {'path': file_path, 'result': None, 'error': str(e)}
+
+# Até esse número de arquivos as threads são sempre usadas: o custo de iniciar
+# processos (spawn) e serializar os resultados não compensa
+_THREAD_BATCH_LIMIT = 50
+
+# Em lotes maiores os primeiros arquivos são lidos e cronometrados; se a média
+# passar do limite a leitura é dominada por CPU e os processos compensam
+_SAMPLE_FILES = 3
+_PROCESS_MIN_SECONDS_PER_FILE = 0.2
+
+def _make_executor(workers: int, strategy: str = 'process') -> Executor:
+    """Cria o pool usado por batch_read"""
+    # Leitura dominada por E/S (ou por bibliotecas que liberam o GIL)
+    if strategy == 'thread':
+        return ThreadPoolExecutor(max_workers=workers)
+    
+    # Executáveis congelados (PyInstaller etc.) não conseguem iniciar novos
+    # interpretadores de forma confiável: usar threads nesse caso
+    if getattr(sys, 'frozen', False):
+        return ThreadPoolExecutor(max_workers=workers)
+    
+    # O servidor do Streamlit é multithread, então fork não é seguro
+    return ProcessPoolExecutor(max_workers=workers,
+                               mp_context=multiprocessing.get_context('spawn'))
+
+def _default_workers(strategy: str) -> int:
+    """Quantidade padrão de workers: threads esperam E/S, processos disputam CPU"""
+    cpu_count = os.cpu_count() or 1
+    return min(32, cpu_count * 4) if strategy == 'thread' else cpu_count
+
+def _has_native_pdf_items(items: List[Tuple[str, str]]) -> bool:
+    """Indica se o lote tem mais de um PDF e PyMuPDF ou PDFium está instalado"""
+    pdf_count = sum(1 for _, file_type in items if file_type == 'pdf')
+    return pdf_count > 1 and (_is_installed('fitz') or _is_installed('pypdfium2'))
+
+def _read_items(items: List[Tuple[str, str]], strategy: str,
+                workers: Optional[int]) -> Iterator[Dict[str, Any]]:
+    """Lê os arquivos com a estratégia escolhida, gerando os resultados na ordem da entrada"""
+    if workers is not None and workers <= 1:
+        yield from map(_read_worker, items)
+        return
+    
+    if strategy == 'auto':
+        if len(items) <= _THREAD_BATCH_LIMIT:
+            strategy = 'thread'
+        elif _has_native_pdf_items(items):
+            # PyMuPDF/PDFium são serializados por _NATIVE_PDF_LOCK nas threads:
+            # em lotes grandes só processos leem vários PDFs ao mesmo tempo
+            strategy = 'process'
+        else:
+            # Cronometrar os primeiros arquivos, lidos neste processo
+            started = time.perf_counter()
+            for item in items[:_SAMPLE_FILES]:
+                yield _read_worker(item)
+            seconds_per_file = (time.perf_counter() - started) / _SAMPLE_FILES
+            
+            items = items[_SAMPLE_FILES:]
+            strategy = 'process' if seconds_per_file > _PROCESS_MIN_SECONDS_PER_FILE else 'thread'
+    
+    workers = min(workers or _default_workers(strategy), len(items))
+    if workers <= 1:
+        yield from map(_read_worker, items)
+        return
+    
+    # Processos recebem os arquivos em lotes para diluir o custo de serialização
+    chunksize = 1 if strategy == 'thread' else max(1, min(4, len(items) // workers))
+    completed = 0
+    try:
+        with _make_executor(workers, strategy) as executor:
+            for read_result in executor.map(_read_worker, items, chunksize=chunksize):
+                yield read_result
+                completed += 1
+    except BrokenExecutor:
+        # Um worker morreu (ex.: biblioteca nativa travou em um arquivo
+        # corrompido): os arquivos restantes são lidos um a um, isolando o culpado
+        yield from _read_isolated(items[completed:])
+
+def _read_isolated(items: List[Tuple[str, str]]) -> Iterator[Dict[str, Any]]:
+    """
+    Lê os arquivos um de cada vez em um único processo, recriado quando morre;
+    só o arquivo que derrubou o processo recebe erro
+    """
+    executor = None
+    try:
+        for item in items:
+            if executor is None:
+                executor = _make_executor(1, 'process')
+            try:
+                read_result = executor.submit(_read_worker, item).result()
+            except BrokenExecutor as e:
+                executor.shutdown(wait=False)
+                executor = None
+                read_result = {'path': item[0], 'result': None,
+                               'error': f'Falha no processo de leitura: {e}'}
+            yield read_result
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+def batch_read(paths_with_types: Iterable[Tuple[str, str]],
+               workers: Optional[int] = None,
+               progress_cb: Optional[Callable[[int, int], None]] = None,
+               strategy: str = 'auto') -> List[Dict[str, Any]]:
+    """
+    Lê vários arquivos em paralelo usando um pool de threads ou de processos
+    
+    Arquivos já lidos e não modificados desde então são servidos do cache,
+    evitando reprocessar tudo a cada rerun do Streamlit. Arquivos idênticos
+    dentro do mesmo lote são lidos uma única vez. Se um processo do pool
+    morrer, os arquivos restantes são lidos um a um e apenas o que derrubou o
+    processo volta com erro.
+    
+    Args:
+        paths_with_types: Pares (caminho, tipo) dos arquivos a serem lidos
+        workers: Quantidade de threads/processos (padrão: depende da estratégia)
+        progress_cb: Função chamada com (concluídos, total) após cada arquivo
+        strategy: 'thread', 'process' ou 'auto' (threads para lotes pequenos;
+            nos maiores, processos para PDFs lidos por PyMuPDF/PDFium ou
+            leituras dominadas por CPU)
+    
+    Returns:
+        Lista na mesma ordem da entrada com {'path', 'result', 'error'}
+    """
+    if strategy not in ('auto', 'thread', 'process'):
+        raise ValueError(f"Estratégia de leitura inválida: {strategy}")
+    
+    items = list(paths_with_types)
+    total = len(items)
+    results: List[Optional[Dict[str, Any]]] = [None] * total
+    done = 0
+    
+    # Separar o que já está em cache do que precisa ser lido
+    pending = []
+    for index, item in enumerate(items):
+        try:
+            file_stat = os.stat(item[0])
+        except OSError:
+            file_stat = None
+        
+        cache_key = _read_cache_key(*item, file_stat)
+        cached = _read_cache.get(cache_key) if cache_key else None
+        if cached is not None:
+            results[index] = {'path': item[0], 'result': cached, 'error': ''}
+            done += 1
+        else:
+            pending.append((index, cache_key, item, file_stat.st_size if file_stat else -1))
+    
+    if progress_cb and done:
+        progress_cb(done, total)
+    
+    if len(_read_cache) + len(pending) > _READ_CACHE_MAX_ENTRIES:
+        _read_cache.clear()
+    
+    if not pending:
+        return results
+    
+    # Cópias idênticas (backups, downloads repetidos) são lidas uma única vez
+    duplicates = _group_duplicates(pending)
+    copies = {position for positions in duplicates.values() for position in positions}
+    to_read = [position for position in range(len(pending)) if position not in copies]
+    
+    read_results = _read_items([pending[position][2] for position in to_read], strategy, workers)
+    
+    try:
+        for position, read_result in zip(to_read, read_results):
+            for same_position in (position, *duplicates.get(position, ())):
+                index, cache_key, item, _ = pending[same_position]
+                if same_position != position:
+                    read_result = dict(read_result, path=item[0])
+                
+                results[index] = read_result
+                if cache_key and read_result['result'] is not None:
+                    _read_cache[cache_key] = read_result['result']
+                done += 1
+                if progress_cb:
+                    progress_cb(done, total)
+    finally:
+        read_results.close()
+    
+    return results
@@ -5,42 +5,237 @@ Padrão: TituloExtraido_DataHora.extensao
 """
 
 import os
+import sys
+import re
 import json
+import functools
 import shutil
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from .encoding_utils import safe_filename, normalize_text
-from .file_readers import get_file_reader
+from .file_readers import batch_read
+from .file_scanner import EXT_TO_TYPE
+
+# Tudo que não for letra (incluindo acentuadas), dígito, '_' ou '-'
+_BAD_CHARS_RE = re.compile(r'[^\w-]+')
+
+# Sequências de espaços em branco
+_SPACE_RE = re.compile(r'\s+')
+
+@functools.lru_cache(maxsize=4096)
+def _clean_title(title: str) -> str:
+    """
+    Converte o título extraído na parte do nome do arquivo antes da data/hora
+    
+    Memoizado: títulos se repetem com frequência (várias versões do mesmo
+    documento) e a normalização Unicode é a parte mais cara do processo
+    """
+    # Limpar e normalizar título
+    clean_title = normalize_text(title) if title else "arquivo"
+    clean_title = safe_filename(clean_title, max_length=100)  # Deixar espaço para timestamp
+    
+    # Remover espaços e caracteres especiais do título
+    clean_title = _BAD_CHARS_RE.sub('', _SPACE_RE.sub('_', clean_title))
+    
+    # Garantir que não está vazio
+    if not clean_title or clean_title == '_':
+        clean_title = "arquivo"
+    
+    return clean_title
+
+# orjson (nativo) é bem mais rápido; json da biblioteca padrão fica como alternativa
+try:
+    import orjson
+    
+    def _dumps(obj, indent: bool = False) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj, indent: bool = False) -> bytes:
+        return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+    
+    _loads = json.loads
+
+# Atributos estendidos usados como cache do título extraído: nativos no Linux,
+# pacote xattr (opcional) no macOS. No Windows (Alternate Data Streams) a escrita
+# no stream altera a data de modificação do arquivo e invalidaria o próprio cache,
+# por isso não há cache nessa plataforma
+if hasattr(os, 'getxattr'):
+    _getxattr, _setxattr = os.getxattr, os.setxattr
+else:
+    try:
+        import xattr as _xattr
+        _getxattr, _setxattr = _xattr.getxattr, _xattr.setxattr
+    except ImportError:
+        _getxattr = _setxattr = None
+
+_TITLE_XATTR = 'user.rename.title'
+_PREVIEW_XATTR = 'user.rename.preview'
+_MTIME_XATTR = 'user.rename.mtime'
+
+# O preview exibe 100 caracteres; guardar um a mais preserva a indicação de corte
+_CACHED_PREVIEW_CHARS = 101
+
+def _read_cached_result(file_path: str) -> Optional[Tuple[str, str]]:
+    """
+    Retorna (título, preview) gravados em uma leitura anterior, se o arquivo
+    não foi modificado desde então (mesmo st_mtime_ns)
+    """
+    if _getxattr is None:
+        return None
+    
+    try:
+        cached_mtime = int(_getxattr(file_path, _MTIME_XATTR))
+        if cached_mtime != os.stat(file_path).st_mtime_ns:
+            return None
+        title = _getxattr(file_path, _TITLE_XATTR).decode('utf-8')
+        content_preview = _getxattr(file_path, _PREVIEW_XATTR).decode('utf-8')
+    except (OSError, ValueError):
+        return None
+    
+    return (title, content_preview) if title else None
+
+def _write_cached_result(file_path: str, title: str, content_preview: str):
+    """
+    Grava título e início do preview nos atributos estendidos do arquivo, apenas
+    se forem diferentes dos já gravados (falhas são ignoradas)
+    """
+    if _setxattr is None or not title:
+        return
+    
+    content_preview = content_preview[:_CACHED_PREVIEW_CHARS]
+    if _read_cached_result(file_path) == (title, content_preview):
+        return
+    
+    try:
+        # Gravar atributos não altera st_mtime, então a marca continua válida;
+        # ela é gravada por último para só valer com título e preview completos
+        mtime_ns = os.stat(file_path).st_mtime_ns
+        _setxattr(file_path, _TITLE_XATTR, title.encode('utf-8'))
+        _setxattr(file_path, _PREVIEW_XATTR, content_preview.encode('utf-8'))
+        _setxattr(file_path, _MTIME_XATTR, str(mtime_ns).encode('ascii'))
+    except OSError:
+        pass  # Sistema de arquivos sem suporte a xattr ou sem permissão
+
+# Windows e macOS (por padrão) não diferenciam maiúsculas em nomes de arquivo;
+# nos demais sistemas "Relatorio.pdf" e "relatorio.pdf" não conflitam
+_CASE_INSENSITIVE_NAMES = os.name == 'nt' or sys.platform == 'darwin'
+
+def _name_key(name: str) -> str:
+    """Forma do nome usada para detectar conflitos no sistema atual"""
+    return name.casefold() if _CASE_INSENSITIVE_NAMES else name
 
 class FileRenamer:
     """Gerenciador de renomeação de arquivos com histórico"""
     
     def __init__(self, base_directory: str):
         self.base_directory = Path(base_directory)
-        self.history_file = self.base_directory / ".rename_history.json"
-        self.history = self._load_history()
+        # Operações em JSON Lines (uma por linha, só acrescentadas) e metadados à parte
+        self.history_file = self.base_directory / ".rename_history.jsonl"
+        self.meta_file = self.base_directory / ".rename_history_meta.json"
+        # Formato antigo (um único JSON), lido apenas para manter o histórico existente
+        self.legacy_history_file = self.base_directory / ".rename_history.json"
+        # Carregado apenas quando necessário (revert_operation / get_history)
+        self._history_cached: Optional[Dict] = None
+    
+    @property
+    def history(self) -> Dict:
+        """Histórico completo, lido do disco no primeiro acesso"""
+        if self._history_cached is None:
+            self._history_cached = self._load_history()
+        return self._history_cached
+    
+    def _stored_created_at(self) -> str:
+        """Data de criação do histórico, sem ler as operações"""
+        if self._history_cached is not None:
+            return self._history_cached['created_at']
+        
+        for source_file in (self.meta_file, self.legacy_history_file):
+            if source_file.exists():
+                try:
+                    with open(source_file, 'rb') as f:
+                        created_at = _loads(f.read()).get('created_at')
+                    if created_at:
+                        return created_at
+                except Exception:
+                    pass
+        
+        return datetime.now().isoformat()
     
     def _load_history(self) -> Dict:
         """Carrega histórico de renomeações"""
+        history = {
+            "operations": [],
+            "created_at": None,
+            "last_operation": None
+        }
+        
+        if self.legacy_history_file.exists():
+            try:
+                with open(self.legacy_history_file, 'rb') as f:
+                    legacy = _loads(f.read())
+                history['operations'].extend(legacy.get('operations', []))
+                history['created_at'] = legacy.get('created_at')
+                history['last_operation'] = legacy.get('last_operation')
+            except Exception:
+                pass
+        
+        if self.meta_file.exists():
+            try:
+                with open(self.meta_file, 'rb') as f:
+                    meta = _loads(f.read())
+                history['created_at'] = meta.get('created_at') or history['created_at']
+                history['last_operation'] = meta.get('last_operation') or history['last_operation']
+            except Exception:
+                pass
+        
         if self.history_file.exists():
             try:
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.history_file, 'rb') as f:
+                    for line in f:
+                        line = line.strip()
+                        if not line:
+                            continue
+                        try:
+                            history['operations'].append(_loads(line))
+                        except json.JSONDecodeError:
+                            continue  # Linha incompleta (escrita interrompida)
             except Exception:
                 pass
         
-        return {
-            "operations": [],
-            "created_at": datetime.now().isoformat(),
-            "last_operation": None
-        }
+        if not history['created_at']:
+            history['created_at'] = datetime.now().isoformat()
+        
+        return history
     
-    def _save_history(self):
-        """Salva histórico de renomeações"""
+    def _save_history(self, operation_record: Dict):
+        """Acrescenta uma operação ao histórico, sem reescrever as anteriores"""
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(self.history, f, indent=2, ensure_ascii=False)
+            with open(self.history_file, 'ab+') as f:
+                # Uma escrita interrompida pode ter deixado a última linha sem
+                # quebra; sem isso o novo registro seria colado nela e perdido
+                if f.seek(0, os.SEEK_END) > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        f.write(b'\n')
+                f.write(_dumps(operation_record) + b'\n')
+                # A linha é o registro usado para desfazer a operação
+                f.flush()
+                os.fsync(f.fileno())
+            
+            # Metadados são pequenos: gravados em arquivo temporário, sincronizados
+            # e trocados de forma atômica, sem risco de ficarem pela metade
+            temp_file = self.meta_file.with_name(self.meta_file.name + '.tmp')
+            with open(temp_file, 'wb') as f:
+                f.write(_dumps({
+                    'created_at': self._stored_created_at(),
+                    'last_operation': operation_record['operation_id']
+                }, indent=True))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, self.meta_file)
         except Exception as e:
             print(f"Erro ao salvar histórico: {e}")
     
@@ -52,94 +247,192 @@ class FileRenamer:
         """
         Gera nome de arquivo seguindo padrão: TituloExtraido_DataHora.extensao
         """
-        original_file = Path(original_path)
-        extension = original_file.suffix
-        
-        # Limpar e normalizar título
-        clean_title = normalize_text(title) if title else "arquivo"
-        clean_title = safe_filename(clean_title, max_length=100)  # Deixar espaço para timestamp
-        
-        # Remover espaços e caracteres especiais do título
-        clean_title = clean_title.replace(' ', '_')
-        clean_title = ''.join(c for c in clean_title if c.isalnum() or c in '-_')
-        
-        # Garantir que não está vazio
-        if not clean_title or clean_title == '_':
-            clean_title = "arquivo"
+        extension = Path(original_path).suffix
+        clean_title = _clean_title(title)
         
         # Montar nome final: TituloExtraido_DataHora.extensao
         new_name = f"{clean_title}_{timestamp}{extension}"
         
         return new_name
     
-    def _resolve_name_conflict(self, target_path: Path) -> Path:
-        """Resolve conflito de nomes adicionando contador"""
-        if not target_path.exists():
-            return target_path
+    def _resolve_name_conflict(self, target_path: Path,
+                               taken_names: Optional[Dict[Path, set]] = None) -> Path:
+        """
+        Resolve conflito de nomes adicionando contador
+        
+        Args:
+            target_path: Caminho desejado
+            taken_names: Nomes ocupados por diretório, compartilhado entre as
+                chamadas de um mesmo lote: cada diretório é listado uma única vez
+                (em vez de um stat por candidato) e os nomes já reservados no
+                lote não são entregues a outro arquivo
+        """
+        if taken_names is None:
+            taken_names = {}
         
-        base_name = target_path.stem
-        extension = target_path.suffix
         parent = target_path.parent
+        taken = taken_names.get(parent)
+        if taken is None:
+            try:
+                taken = {_name_key(name) for name in os.listdir(parent)}
+            except OSError:
+                taken = set()
+            taken_names[parent] = taken
         
-        counter = 1
-        while True:
-            new_name = f"{base_name}_{counter:03d}{extension}"
-            new_path = parent / new_name
-            if not new_path.exists():
-                return new_path
-            counter += 1
+        new_path = target_path
+        if _name_key(target_path.name) in taken:
+            base_name = target_path.stem
+            extension = target_path.suffix
             
-            # Limite de segurança
-            if counter > 999:
-                # Adicionar timestamp mais preciso
+            for counter in range(1, 1000):
+                new_name = f"{base_name}_{counter:03d}{extension}"
+                if _name_key(new_name) not in taken:
+                    new_path = parent / new_name
+                    break
+            else:
+                # Limite de segurança: adicionar timestamp mais preciso
                 precise_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:17]
                 new_name = f"{base_name}_{precise_timestamp}{extension}"
-                return parent / new_name
+                new_path = parent / new_name
+        
+        taken.add(_name_key(new_path.name))
+        return new_path
     
-    def preview_rename(self, file_paths: List[str], file_types: List[str]) -> List[Dict]:
+    def _rename_no_overwrite(self, source: Path, target: Path) -> Path:
+        """
+        Renomeia sem nunca sobrescrever um arquivo existente
+        
+        O nome escolhido no preview pode ter sido ocupado depois. Nesse caso é
+        acrescentado um contador, como em _resolve_name_conflict
+        
+        Returns:
+            Caminho final do arquivo
+        """
+        base_name = target.stem
+        extension = target.suffix
+        
+        candidate = target
+        for counter in range(1, 1000):
+            try:
+                self._exclusive_rename(source, candidate)
+                return candidate
+            except FileExistsError:
+                candidate = target.parent / f"{base_name}_{counter:03d}{extension}"
+        
+        raise FileExistsError(f"Nenhum nome disponível para {target.name}")
+    
+    def _exclusive_rename(self, source: Path, target: Path):
+        """
+        Renomeação que falha com FileExistsError se o destino existir
+        
+        No Windows os.rename já se comporta assim. No POSIX os.rename substitui
+        o destino sem avisar, então é usado os.link (que falha se o nome existir)
+        seguido de os.unlink do nome antigo
+        """
+        if os.name == 'nt':
+            os.rename(source, target)
+            return
+        
+        try:
+            os.link(source, target, follow_symlinks=False)
+        except (FileExistsError, FileNotFoundError):
+            raise
+        except (OSError, NotImplementedError):
+            # Sistema de arquivos sem hardlinks (FAT, alguns compartilhamentos de rede)
+            if os.path.lexists(target):
+                raise FileExistsError(f"Arquivo já existe: {target}")
+            os.rename(source, target)
+            return
+        
+        try:
+            os.unlink(source)
+        except OSError:
+            # Não deixar o arquivo com dois nomes
+            os.unlink(target)
+            raise
+    
+    def preview_rename(self, file_paths: List[str], file_types: List[str],
+                       progress_callback: Optional[Callable[[int, int], None]] = None,
+                       max_workers: Optional[int] = None,
+                       parallel_strategy: str = 'auto') -> List[Dict]:
         """
         Gera preview da renomeação sem executar
         
+        A leitura dos arquivos roda em paralelo; a resolução de conflitos de
+        nome roda depois, neste processo, para não haver corrida no disco.
+        
+        Args:
+            file_paths: Arquivos candidatos à renomeação
+            file_types: Tipos selecionados ('word', 'excel', etc.)
+            progress_callback: Função chamada com (concluídos, total) durante a leitura
+            max_workers: Quantidade de threads/processos de leitura (padrão: depende da estratégia)
+            parallel_strategy: 'thread', 'process' ou 'auto' (escolha pelo tamanho
+                do lote, pela presença de PDFs e pelo tempo de leitura dos primeiros arquivos)
+        
         Returns:
             Lista de dicionários com informações de renomeação
         """
         timestamp = self._generate_timestamp()
         preview_results = []
         
+        # Filtrar arquivos dos tipos selecionados
+        files_to_read = []
         for file_path in file_paths:
+            file_type = EXT_TO_TYPE.get(Path(file_path).suffix.lower(), 'unknown')
+            
+            if file_type in file_types:
+                files_to_read.append((file_path, file_type))
+        
+        # Arquivos com título e preview já gravados em xattr não precisam ser abertos
+        cached_items = {}
+        files_to_parse = []
+        for file_path, file_type in files_to_read:
+            cached = _read_cached_result(file_path)
+            if cached is None:
+                files_to_parse.append((file_path, file_type))
+            else:
+                cached_items[file_path] = {
+                    'path': file_path,
+                    'result': {
+                        'title': cached[0],
+                        'content_preview': cached[1],
+                        'success': True,
+                        'error': ''
+                    },
+                    'error': ''
+                }
+        
+        # Ler conteúdo dos demais arquivos em paralelo
+        parsed_items = {}
+        for read_item in batch_read(files_to_parse, workers=max_workers,
+                                    progress_cb=progress_callback, strategy=parallel_strategy):
+            parsed_items[read_item['path']] = read_item
+            read_result = read_item['result']
+            if not read_item['error'] and read_result['success']:
+                _write_cached_result(read_item['path'], read_result['title'],
+                                     read_result['content_preview'])
+        
+        # Manter a ordem original dos arquivos
+        read_items = [cached_items.get(path) or parsed_items[path] for path, _ in files_to_read]
+        
+        # Nomes ocupados em cada diretório, incluindo os reservados neste preview
+        taken_names: Dict[Path, set] = {}
+        
+        for read_item in read_items:
+            file_path = read_item['path']
+            
             try:
                 file_path_obj = Path(file_path)
+                read_result = read_item['result']
                 
-                # Determinar tipo do arquivo
-                file_extension = file_path_obj.suffix.lower()
-                file_type = self._get_file_type_from_extension(file_extension)
-                
-                if file_type not in file_types:
-                    continue
-                
-                # Ler conteúdo do arquivo
-                reader = get_file_reader(file_type)
-                if not reader:
-                    preview_results.append({
-                        'original_path': file_path,
-                        'original_name': file_path_obj.name,
-                        'new_name': '',
-                        'new_path': '',
-                        'status': 'error',
-                        'error': f'Leitor não disponível para tipo {file_type}'
-                    })
-                    continue
-                
-                read_result = reader.read_file(file_path)
-                
-                if not read_result['success']:
+                if read_item['error'] or not read_result['success']:
                     preview_results.append({
                         'original_path': file_path,
                         'original_name': file_path_obj.name,
                         'new_name': '',
                         'new_path': '',
                         'status': 'error',
-                        'error': read_result['error']
+                        'error': read_item['error'] or read_result['error']
                     })
                     continue
                 
@@ -152,7 +445,7 @@ class FileRenamer:
                 
                 # Resolver conflitos
                 target_path = file_path_obj.parent / new_filename
-                final_path = self._resolve_name_conflict(target_path)
+                final_path = self._resolve_name_conflict(target_path, taken_names)
                 
                 preview_results.append({
                     'original_path': file_path,
@@ -177,18 +470,30 @@ class FileRenamer:
         
         return preview_results
     
-    def execute_rename(self, preview_results: List[Dict]) -> Dict:
+    def execute_rename(self, preview_results: List[Dict],
+                       on_progress: Optional[Callable[[int, int], None]] = None) -> Dict:
         """
         Executa a renomeação baseada no preview
         
+        Args:
+            preview_results: Resultado de preview_rename
+            on_progress: Função chamada com (concluídos, total) durante a execução
+        
         Returns:
             Estatísticas da operação
         """
         operation_id = datetime.now().isoformat()
         successful_renames = []
         failed_renames = []
+        total = len(preview_results)
+        
+        # Permissão de escrita verificada uma vez por diretório
+        writable_cache = {}
         
-        for item in preview_results:
+        for index, item in enumerate(preview_results):
+            if on_progress:
+                on_progress(index, total)
+            
             if item['status'] != 'ready':
                 failed_renames.append({
                     'file': item['original_name'],
@@ -200,39 +505,43 @@ class FileRenamer:
                 original_path = Path(item['original_path'])
                 new_path = Path(item['new_path'])
                 
-                # Verificar se arquivo ainda existe
-                if not original_path.exists():
-                    failed_renames.append({
-                        'file': item['original_name'],
-                        'error': 'Arquivo não encontrado'
-                    })
-                    continue
-                
                 # Verificar permissões
-                if not os.access(original_path.parent, os.W_OK):
+                parent = original_path.parent
+                if parent not in writable_cache:
+                    writable_cache[parent] = os.access(parent, os.W_OK)
+                if not writable_cache[parent]:
                     failed_renames.append({
                         'file': item['original_name'],
                         'error': 'Sem permissão de escrita no diretório'
                     })
                     continue
                 
-                # Executar renomeação
-                original_path.rename(new_path)
+                # Executar renomeação (falha direto se o arquivo não existir mais);
+                # o nome final pode ganhar um contador se o destino foi ocupado
+                new_path = self._rename_no_overwrite(original_path, new_path)
                 
                 successful_renames.append({
                     'original_path': str(original_path),
                     'new_path': str(new_path),
                     'original_name': item['original_name'],
-                    'new_name': item['new_name'],
+                    'new_name': new_path.name,
                     'timestamp': datetime.now().isoformat()
                 })
                 
+            except FileNotFoundError:
+                failed_renames.append({
+                    'file': item['original_name'],
+                    'error': 'Arquivo não encontrado'
+                })
             except Exception as e:
                 failed_renames.append({
                     'file': item['original_name'],
                     'error': str(e)
                 })
         
+        if on_progress:
+            on_progress(total, total)
+        
         # Salvar no histórico
         operation_record = {
             'operation_id': operation_id,
@@ -244,9 +553,11 @@ class FileRenamer:
             'failed_count': len(failed_renames)
         }
         
-        self.history['operations'].append(operation_record)
-        self.history['last_operation'] = operation_id
-        self._save_history()
+        # Só acrescenta ao arquivo; o histórico em memória é atualizado se já foi carregado
+        if self._history_cached is not None:
+            self._history_cached['operations'].append(operation_record)
+            self._history_cached['last_operation'] = operation_id
+        self._save_history(operation_record)
         
         return {
             'operation_id': operation_id,
@@ -298,23 +609,6 @@ class FileRenamer:
             'total_to_revert': len(operation['successful_renames'])
         }
     
-    def _get_file_type_from_extension(self, extension: str) -> str:
-        """Determina tipo do arquivo pela extensão"""
-        extension = extension.lower()
-        
-        if extension in ['.doc', '.docx']:
-            return 'word'
-        elif extension in ['.xls', '.xlsx']:
-            return 'excel'
-        elif extension in ['.ppt', '.pptx']:
-            return 'powerpoint'
-        elif extension == '.pdf':
-            return 'pdf'
-        elif extension == '.csv':
-            return 'csv'
-        else:
-            return 'unknown'
-    
     def get_history(self) -> Dict:
         """Retorna histórico de operações"""
         return self.history
\ No newline at end of file
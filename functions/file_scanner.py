@@ -1,9 +1,12 @@
 # -*- coding: utf-8 -*-
 import os
+import stat
+import functools
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
-from collections import defaultdict
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from .encoding_utils import safe_path_join
+from .fast_stat import fast_stat
 
 # Mapeamento de extensões para tipos de arquivo
 FILE_TYPE_MAPPING = {
@@ -32,91 +35,246 @@ TYPE_ICONS = {
     'csv': '📈'
 }
 
+# Extensão (minúscula) -> tipo de arquivo, uma consulta por arquivo
+EXT_TO_TYPE = {
+    extension: file_type
+    for file_type, extensions in FILE_TYPE_MAPPING.items()
+    for extension in extensions
+}
+
+@functools.lru_cache(maxsize=256)
+def _classify(suffix: str) -> str:
+    """
+    Tipo de arquivo a partir da extensão como aparece no nome (sem converter
+    para minúsculas antes): uma árvore tem poucas extensões distintas, então
+    quase todas as chamadas são respondidas pelo cache
+    """
+    return EXT_TO_TYPE.get(suffix.lower(), 'unknown')
+
 def get_file_type(file_path: Path) -> str:
     """Determina o tipo de arquivo baseado na extensão"""
-    extension = file_path.suffix.lower()
+    return _classify(file_path.suffix)
+
+# Caminhos guardados por tipo na análise: a lista completa é obtida só na hora
+# de processar, com get_files_by_type
+FILES_SAMPLE_SIZE = 20
+
+# Quantidade de arquivos por tipo a partir da qual o escaneamento pode parar
+DEFAULT_MAX_FILES_PER_TYPE = 1000
+
+# Threads que listam diretórios ao mesmo tempo (como o --stat-threads do rclone):
+# em discos de rede (SMB/NFS) a latência de cada listagem domina o tempo
+DEFAULT_STAT_THREADS = 16
+
+def _list_directory(directory_path: str) -> Tuple[List[os.DirEntry], List[str]]:
+    """
+    Lista um único diretório, separando arquivos e subdiretórios
     
-    for file_type, extensions in FILE_TYPE_MAPPING.items():
-        if extension in extensions:
-            return file_type
+    is_dir/is_file com follow_symlinks=False usam o tipo informado pela própria
+    listagem do diretório, sem um stat por entrada
+    """
+    with os.scandir(directory_path) as entries:
+        return _split_entries(entries)
+
+def _split_entries(entries: Iterable[os.DirEntry]) -> Tuple[List[os.DirEntry], List[str]]:
+    """Separa entradas de uma listagem em arquivos e caminhos de subdiretórios"""
+    files = []
+    subdirs = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            subdirs.append(entry.path)
+        elif entry.is_file(follow_symlinks=False):
+            files.append(entry)
+    return files, subdirs
+
+def _walk_files(directory_path: str, stat_threads: int = 1,
+                top_entries: Optional[List[os.DirEntry]] = None) -> Iterator[os.DirEntry]:
+    """
+    Percorre a árvore de diretórios com os.scandir, gerando os arquivos
     
-    return 'unknown'
+    Com stat_threads > 1 os subdiretórios são listados em paralelo; os
+    resultados são consumidos apenas pela thread que chamou, então quem junta
+    os dados não precisa de lock. Subdiretórios sem permissão de leitura são
+    ignorados; uma falha ao listar a raiz é propagada. top_entries, se
+    informado, é a listagem da raiz já feita por quem chamou
+    """
+    if top_entries is not None:
+        files, subdirs = _split_entries(top_entries)
+    else:
+        files, subdirs = _list_directory(directory_path)
+    yield from files
+    
+    if stat_threads <= 1:
+        # Pilha em ordem inversa: subdiretórios visitados em ordem de listagem
+        pending_dirs = list(reversed(subdirs))
+        while pending_dirs:
+            try:
+                files, subdirs = _list_directory(pending_dirs.pop())
+            except OSError:
+                continue
+            yield from files
+            pending_dirs.extend(reversed(subdirs))
+        return
+    
+    executor = ThreadPoolExecutor(max_workers=stat_threads)
+    try:
+        pending = {executor.submit(_list_directory, subdir) for subdir in subdirs}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    files, subdirs = future.result()
+                except OSError:
+                    continue
+                pending.update(executor.submit(_list_directory, subdir) for subdir in subdirs)
+                yield from files
+    finally:
+        # Se o consumidor parar antes, as listagens ainda não iniciadas são canceladas
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def _make_bucket(file_type: str) -> Dict:
+    """Cria o grupo de um tipo na análise, com nome amigável e ícone já definidos"""
+    return {
+        'count': 0,
+        'truncated': False,
+        'files': [],
+        'basenames': [],
+        'extensions': set(),
+        'friendly_name': FRIENDLY_NAMES.get(file_type, file_type),
+        'icon': TYPE_ICONS.get(file_type, '📄')
+    }
 
-def scan_directory(directory_path: str) -> Dict:
+def scan_directory(directory_path: str, stat_threads: int = DEFAULT_STAT_THREADS,
+                   top_entries: Optional[List[os.DirEntry]] = None,
+                   max_files_per_type: Optional[int] = DEFAULT_MAX_FILES_PER_TYPE) -> Dict:
     """
     Escaneia um diretório e categoriza os arquivos por tipo
     
+    Args:
+        directory_path: Diretório a ser escaneado (recursivamente)
+        stat_threads: Quantidade de threads listando diretórios em paralelo
+            (1 percorre a árvore sequencialmente)
+        top_entries: Listagem (os.scandir) do próprio diretório, se já foi
+            feita, para não listá-lo de novo
+        max_files_per_type: Quando todos os tipos suportados atingem essa
+            quantidade o escaneamento para e as contagens desses tipos passam
+            a ser parciais ('truncated'). None percorre a árvore inteira
+    
     Returns:
         Dict com informações sobre os arquivos encontrados
     """
     directory = Path(directory_path)
     
-    if not directory.exists() or not directory.is_dir():
+    dir_stat = fast_stat(directory_path)
+    if dir_stat is None or not stat.S_ISDIR(dir_stat.st_mode):
         return None
     
     # Estrutura para armazenar os resultados
     analysis = {
         'directory': str(directory),
-        'file_types': defaultdict(lambda: {
-            'count': 0,
-            'files': [],
-            'extensions': set(),
-            'friendly_name': '',
-            'icon': ''
-        }),
+        'file_types': {},
         'total_files': 0,
         'supported_files': 0,
-        'unsupported_files': 0
+        'unsupported_files': 0,
+        'truncated': False
     }
     
+    # Referências e contadores locais: o laço roda uma vez por arquivo
+    file_types = analysis['file_types']
+    total_files = 0
+    supported_files = 0
+    
+    # Tipos que já atingiram o limite
+    done_types = set()
+    all_types = len(FILE_TYPE_MAPPING)
+    
     try:
         # Escanear todos os arquivos
-        for file_path in directory.rglob('*'):
-            if file_path.is_file():
-                analysis['total_files'] += 1
-                
-                file_type = get_file_type(file_path)
-                
-                if file_type != 'unknown':
-                    # Arquivo suportado
-                    analysis['supported_files'] += 1
-                    analysis['file_types'][file_type]['count'] += 1
-                    # Usar representação segura do caminho
-                    analysis['file_types'][file_type]['files'].append(safe_path_join(str(file_path)))
-                    analysis['file_types'][file_type]['extensions'].add(file_path.suffix.lower())
-                    analysis['file_types'][file_type]['friendly_name'] = FRIENDLY_NAMES.get(file_type, file_type)
-                    analysis['file_types'][file_type]['icon'] = TYPE_ICONS.get(file_type, '📄')
-                else:
-                    # Arquivo não suportado
-                    analysis['unsupported_files'] += 1
+        walker = _walk_files(str(directory), stat_threads, top_entries)
+        for entry in walker:
+            total_files += 1
+            
+            # Arquivos sem extensão nem chegam a ser classificados
+            suffix = os.path.splitext(entry.name)[1]
+            file_type = _classify(suffix) if suffix else 'unknown'
+            
+            if file_type == 'unknown':
+                # Arquivo não suportado
+                continue
+            
+            # Arquivo suportado; o grupo do tipo é criado apenas na primeira vez
+            supported_files += 1
+            bucket = file_types.get(file_type) or file_types.setdefault(file_type, _make_bucket(file_type))
+            
+            bucket['count'] += 1
+            if len(bucket['files']) < FILES_SAMPLE_SIZE:
+                # Usar representação segura do caminho; o nome é guardado à
+                # parte para a interface não precisar extraí-lo a cada rerun
+                bucket['files'].append(safe_path_join(entry.path))
+                bucket['basenames'].append(entry.name)
+            bucket['extensions'].add(suffix.lower())
+            
+            if max_files_per_type and bucket['count'] == max_files_per_type:
+                done_types.add(file_type)
+                if len(done_types) == all_types:
+                    # Prévia suficiente de todos os tipos: o restante não é percorrido
+                    analysis['truncated'] = True
+                    walker.close()
+                    break
         
-        # Converter sets para listas para serialização
-        for file_type_data in analysis['file_types'].values():
-            file_type_data['extensions'] = list(file_type_data['extensions'])
+        if analysis['truncated']:
+            # A árvore não foi percorrida até o fim: contagens no limite podem ser maiores
+            for file_type in done_types:
+                file_types[file_type]['truncated'] = True
         
-        # Converter defaultdict para dict normal
-        analysis['file_types'] = dict(analysis['file_types'])
+        analysis['total_files'] = total_files
+        analysis['supported_files'] = supported_files
+        analysis['unsupported_files'] = total_files - supported_files
+        
+        # Converter sets para listas para serialização; com várias threads a
+        # ordem de chegada varia, então a amostra de caminhos é ordenada
+        for file_type_data in file_types.values():
+            file_type_data['extensions'] = list(file_type_data['extensions'])
+            sample = sorted(zip(file_type_data['files'], file_type_data['basenames']))
+            file_type_data['files'] = [path for path, _ in sample]
+            file_type_data['basenames'] = [name for _, name in sample]
         
         return analysis
         
-    except PermissionError:
+    except OSError:
+        # Não foi possível listar o próprio diretório escolhido
         return None
 
-def get_files_by_type(analysis: Dict, file_types: List[str]) -> List[str]:
+def directory_fingerprint(directory_path: str) -> tuple:
+    """Impressão digital barata da pasta: um único stat"""
+    dir_stat = os.stat(directory_path)
+    return (dir_stat.st_mtime_ns, dir_stat.st_size)
+
+def get_files_by_type(directory_path: str, file_types: List[str],
+                      stat_threads: int = DEFAULT_STAT_THREADS) -> List[str]:
     """
     Retorna lista de arquivos dos tipos selecionados
     
+    A análise guarda apenas uma amostra dos caminhos de cada tipo, então a
+    árvore é percorrida novamente aqui, quando o processamento é solicitado
+    
     Args:
-        analysis: Resultado do scan_directory
+        directory_path: Diretório analisado com scan_directory
         file_types: Lista de tipos de arquivo ('word', 'excel', etc.)
+        stat_threads: Quantidade de threads listando diretórios em paralelo
     
     Returns:
         Lista de caminhos de arquivo
     """
+    selected = set(file_types)
     files = []
     
-    for file_type in file_types:
-        if file_type in analysis['file_types']:
-            files.extend(analysis['file_types'][file_type]['files'])
+    try:
+        for entry in _walk_files(directory_path, stat_threads):
+            if _classify(os.path.splitext(entry.name)[1]) in selected:
+                files.append(safe_path_join(entry.path))
+    except OSError:
+        return []
     
-    return files
\ No newline at end of file
+    files.sort()
+    return files
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Testes da renomeação sem sobrescrita e do histórico em JSON Lines
+"""
+
+import errno
+import json
+import os
+
+from functions.file_renamer import FileRenamer
+
+def _ready_item(source, target):
+    """Item de preview pronto para renomear, como gerado por preview_rename"""
+    return {
+        'original_path': str(source),
+        'original_name': source.name,
+        'new_name': target.name,
+        'new_path': str(target),
+        'status': 'ready',
+        'error': ''
+    }
+
+def test_destino_criado_apos_preview_nao_e_sobrescrito(tmp_path):
+    source = tmp_path / 'arquivo.txt'
+    source.write_text('origem')
+    target = tmp_path / 'Titulo.txt'
+    
+    preview = [_ready_item(source, target)]
+    target.write_text('existente')  # Ocupado entre o preview e a execução
+    
+    result = FileRenamer(str(tmp_path)).execute_rename(preview)
+    
+    assert result['successful'] == 1
+    assert target.read_text() == 'existente'
+    assert (tmp_path / 'Titulo_001.txt').read_text() == 'origem'
+    assert not source.exists()
+
+def test_contador_avanca_ate_nome_livre(tmp_path):
+    source = tmp_path / 'arquivo.txt'
+    source.write_text('origem')
+    target = tmp_path / 'Titulo.txt'
+    target.write_text('a')
+    (tmp_path / 'Titulo_001.txt').write_text('b')
+    
+    renamer = FileRenamer(str(tmp_path))
+    final_path = renamer._rename_no_overwrite(source, target)
+    
+    assert final_path == tmp_path / 'Titulo_002.txt'
+    assert final_path.read_text() == 'origem'
+    assert target.read_text() == 'a'
+    assert (tmp_path / 'Titulo_001.txt').read_text() == 'b'
+
+def test_sem_hardlinks_tambem_nao_sobrescreve(tmp_path, monkeypatch):
+    def link_unsupported(*args, **kwargs):
+        raise OSError(errno.EPERM, 'hardlinks não suportados')
+    
+    monkeypatch.setattr(os, 'link', link_unsupported)
+    source = tmp_path / 'arquivo.txt'
+    source.write_text('origem')
+    target = tmp_path / 'Titulo.txt'
+    target.write_text('existente')
+    
+    final_path = FileRenamer(str(tmp_path))._rename_no_overwrite(source, target)
+    
+    assert final_path == tmp_path / 'Titulo_001.txt'
+    assert target.read_text() == 'existente'
+    assert final_path.read_text() == 'origem'
+
+def test_arquivo_removido_apos_preview(tmp_path):
+    source = tmp_path / 'sumiu.txt'
+    target = tmp_path / 'Titulo.txt'
+    
+    result = FileRenamer(str(tmp_path)).execute_rename([_ready_item(source, target)])
+    
+    assert result['successful'] == 0
+    assert result['failed_renames'] == [{'file': 'sumiu.txt', 'error': 'Arquivo não encontrado'}]
+    assert not target.exists()
+
+def test_historico_legado_e_jsonl_sao_combinados(tmp_path):
+    legacy_operation = {'operation_id': 'antiga', 'successful_renames': []}
+    (tmp_path / '.rename_history.json').write_text(json.dumps({
+        'operations': [legacy_operation],
+        'created_at': '2024-01-01T00:00:00',
+        'last_operation': 'antiga'
+    }))
+    
+    new_operation = {'operation_id': 'nova', 'successful_renames': []}
+    with open(tmp_path / '.rename_history.jsonl', 'w', encoding='utf-8') as f:
+        f.write(json.dumps(new_operation) + '\n')
+        f.write('{"operation_id": "interromp')  # Última linha cortada no meio
+    
+    history = FileRenamer(str(tmp_path)).get_history()
+    
+    assert [op['operation_id'] for op in history['operations']] == ['antiga', 'nova']
+    assert history['created_at'] == '2024-01-01T00:00:00'
+
+def test_nova_operacao_e_acrescentada_ao_historico(tmp_path):
+    (tmp_path / '.rename_history.json').write_text(json.dumps({
+        'operations': [{'operation_id': 'antiga', 'successful_renames': []}],
+        'created_at': '2024-01-01T00:00:00',
+        'last_operation': 'antiga'
+    }))
+    source = tmp_path / 'arquivo.txt'
+    source.write_text('origem')
+    
+    result = FileRenamer(str(tmp_path)).execute_rename([_ready_item(source, tmp_path / 'Titulo.txt')])
+    history = FileRenamer(str(tmp_path)).get_history()
+    
+    assert [op['operation_id'] for op in history['operations']] == ['antiga', result['operation_id']]
+    assert history['last_operation'] == result['operation_id']
+    assert history['created_at'] == '2024-01-01T00:00:00'
+
+def test_operacao_acrescentada_apos_linha_cortada(tmp_path):
+    with open(tmp_path / '.rename_history.jsonl', 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'operation_id': 'op1', 'successful_renames': []}) + '\n')
+        f.write('{"operation_id": "op2", "succ')  # Escrita interrompida
+    source = tmp_path / 'arquivo.txt'
+    source.write_text('origem')
+    
+    result = FileRenamer(str(tmp_path)).execute_rename([_ready_item(source, tmp_path / 'Titulo.txt')])
+    history = FileRenamer(str(tmp_path)).get_history()
+    
+    assert [op['operation_id'] for op in history['operations']] == ['op1', result['operation_id']]
@@ -33,6 +33,11 @@ def render_file_analysis(analysis: Dict):
             help="Quantos tipos de arquivo diferentes foram encontrados"
         )
     
+    if analysis.get('truncated'):
+        st.info("ℹ️ Diretório muito grande: a análise parou ao encontrar arquivos suficientes "
+                "de cada tipo, então as contagens são parciais. Todos os arquivos serão "
+                "considerados no processamento.")
+    
     st.divider()
     
     # Cards para cada tipo de arquivo
@@ -60,23 +65,14 @@ def render_file_type_card(file_type: str, data: Dict):
     count = data.get('count', 0)
     extensions = data.get('extensions', [])
     
-    # Card container
-    with st.container():
-        st.markdown(f"""
-        <div style="
-            border: 1px solid #ddd;
-            border-radius: 10px;
-            padding: 15px;
-            margin: 5px;
-            text-align: center;
-            background-color: #000;
-        ">
-            <h3 style="color:#fff;">{icon}</h3>
-            <h4 style="color:#fff;">{friendly_name}</h4>
-            <p style="color:#fff;"><strong>{count}</strong> arquivo{'s' if count != 1 else ''}</p>
-            <small style="color:#ccc;">{', '.join(extensions)}</small>
-        </div>
-        """, unsafe_allow_html=True)
+    # Card com componentes nativos (sem HTML)
+    with st.container(border=True):
+        st.markdown(f"### {icon} {friendly_name}")
+        st.metric(
+            label="Arquivos",
+            value=f"{count}+" if data.get('truncated') else count
+        )
+        st.caption(', '.join(extensions))
 
 def render_file_details(file_types: Dict):
     """Renderiza detalhes expandidos dos arquivos"""
@@ -87,20 +83,21 @@ def render_file_details(file_types: Dict):
         col1, col2 = st.columns([1, 3])
         
         with col1:
-            st.write(f"**Quantidade:** {data['count']}")
+            partial = '+' if data.get('truncated') else ''  # Contagem parcial (diretório muito grande)
+            st.write(f"**Quantidade:** {data['count']}{partial}")
             st.write(f"**Extensões:** {', '.join(data['extensions'])}")
         
         with col2:
             # Lista dos arquivos (limitada para não sobrecarregar a interface)
-            files = data['files'][:10]  # Mostrar apenas os primeiros 10
+            names = data['basenames'][:10]  # Mostrar apenas os primeiros 10
             
-            if files:
+            if names:
                 st.write("**Arquivos encontrados:**")
-                for file_path in files:
-                    file_name = file_path.split('/')[-1]  # Apenas o nome do arquivo
-                    st.write(f"• {file_name}")
+                st.markdown('\n'.join(f"• {file_name}  " for file_name in names))
                 
-                if len(data['files']) > 10:
-                    st.write(f"... e mais {len(data['files']) - 10} arquivo(s)")
+                if data.get('truncated'):
+                    st.write(f"... e mais {data['count'] - 10}+ arquivo(s) (contagem parcial)")
+                elif data['count'] > 10:
+                    st.write(f"... e mais {data['count'] - 10} arquivo(s)")
         
         st.divider()
\ No newline at end of file
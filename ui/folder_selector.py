@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 import streamlit as st
 import os
-from pathlib import Path
+import stat
+from functions.fast_stat import fast_stat
 
 def render_folder_selector():
     """Renderiza o componente de seleção de pasta"""
@@ -23,14 +24,21 @@ def render_folder_selector():
     
     # Validação do diretório
     if directory_path:
-        if os.path.exists(directory_path) and os.path.isdir(directory_path):
+        # Uma única consulta (statx no Linux) em vez de exists + isdir
+        dir_stat = fast_stat(directory_path)
+        if dir_stat and stat.S_ISDIR(dir_stat.st_mode):
             st.success(f"✅ Diretório válido: `{directory_path}`")
             
             # Mostrar informações básicas do diretório
             try:
-                files = list(Path(directory_path).iterdir())
-                total_files = len([f for f in files if f.is_file()])
-                total_dirs = len([f for f in files if f.is_dir()])
+                # O tipo de cada entrada vem da própria listagem (sem stat por item);
+                # a listagem fica guardada para a análise não repetir a leitura da raiz
+                with os.scandir(directory_path) as entries:
+                    files = list(entries)
+                st.session_state['_top_entries'] = (directory_path, files)
+                
+                total_files = sum(1 for entry in files if entry.is_file(follow_symlinks=False))
+                total_dirs = sum(1 for entry in files if entry.is_dir(follow_symlinks=False))
                 
                 col1, col2, col3 = st.columns(3)
                 with col1:
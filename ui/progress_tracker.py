@@ -4,11 +4,21 @@ Interface de progresso e processamento de arquivos
 """
 
 import streamlit as st
-import time
 from typing import List, Dict, Any
-from functions.file_scanner import get_files_by_type
+from functions.file_scanner import get_files_by_type, directory_fingerprint
 from functions.file_renamer import FileRenamer
 
+def _get_renamer(directory_path: str) -> FileRenamer:
+    """
+    Reaproveita o FileRenamer de cada diretório entre os reruns da sessão,
+    junto com o histórico que ele já tenha carregado
+    """
+    renamers = st.session_state.setdefault('_renamers', {})
+    renamer = renamers.get(directory_path)
+    if renamer is None:
+        renamer = renamers[directory_path] = FileRenamer(directory_path)
+    return renamer
+
 def render_processing_interface(directory_path: str, selected_types: List[str], file_analysis: Dict):
     """
     Renderiza interface completa de processamento com preview e execução
@@ -47,34 +57,64 @@ def render_preview_section(directory_path: str, selected_types: List[str], file_
     st.divider()
     st.subheader("🔍 Preview da Renomeação")
     
-    # Obter arquivos dos tipos selecionados
-    files_to_process = get_files_by_type(file_analysis, selected_types)
-    
-    if not files_to_process:
-        st.warning("Nenhum arquivo encontrado para os tipos selecionados.")
-        return
+    # Reaproveitar o preview entre reruns (filtros, botões) enquanto a pasta,
+    # seu conteúdo e os tipos selecionados forem os mesmos
+    preview_key = (directory_path, directory_fingerprint(directory_path), tuple(selected_types))
+    preview = st.session_state.get('preview_data')
     
-    # Gerar preview
-    with st.spinner(f"Analisando {len(files_to_process)} arquivo(s)..."):
-        renamer = FileRenamer(directory_path)
-        preview_data = renamer.preview_rename(files_to_process, selected_types)
-        st.session_state.preview_data = preview_data
+    if preview is None or preview['key'] != preview_key:
+        # Obter arquivos dos tipos selecionados (percorre a pasta novamente)
+        files_to_process = get_files_by_type(directory_path, selected_types)
+        
+        if not files_to_process:
+            st.warning("Nenhum arquivo encontrado para os tipos selecionados.")
+            return
+        
+        # Gerar preview
+        with st.spinner(f"Analisando {len(files_to_process)} arquivo(s)..."):
+            progress_bar = st.progress(0)
+            
+            def update_progress(done: int, total: int):
+                progress_bar.progress(done / total, text=f"Lendo arquivos... {done}/{total}")
+            
+            renamer = _get_renamer(directory_path)
+            preview_data = renamer.preview_rename(files_to_process, selected_types, progress_callback=update_progress)
+            preview = _partition_preview(preview_data, preview_key)
+            st.session_state.preview_data = preview
+            progress_bar.empty()
     
     # Mostrar estatísticas do preview
-    render_preview_stats(preview_data)
+    render_preview_stats(preview)
     
     # Mostrar tabela de preview
-    render_preview_table(preview_data)
+    render_preview_table(preview)
     
     # Botões de ação
-    render_action_buttons(preview_data, directory_path)
+    render_action_buttons(preview, directory_path)
 
-def render_preview_stats(preview_data: List[Dict]):
+def _partition_preview(preview_data: List[Dict], key: Any) -> Dict[str, Any]:
+    """
+    Separa o preview por status em uma única passada
+    
+    Returns:
+        {'key', 'all', 'ready', 'errors'}, usado por todas as seções do preview
+    """
+    ready = []
+    errors = []
+    for item in preview_data:
+        if item['status'] == 'ready':
+            ready.append(item)
+        else:
+            errors.append(item)
+    
+    return {'key': key, 'all': preview_data, 'ready': ready, 'errors': errors}
+
+def render_preview_stats(preview: Dict[str, Any]):
     """Renderiza estatísticas do preview"""
     
-    ready_count = len([p for p in preview_data if p['status'] == 'ready'])
-    error_count = len([p for p in preview_data if p['status'] == 'error'])
-    total_count = len(preview_data)
+    ready_count = len(preview['ready'])
+    error_count = len(preview['errors'])
+    total_count = len(preview['all'])
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -91,7 +131,7 @@ def render_preview_stats(preview_data: List[Dict]):
         success_rate = (ready_count / total_count * 100) if total_count > 0 else 0
         st.metric("Taxa de Sucesso", f"{success_rate:.1f}%")
 
-def render_preview_table(preview_data: List[Dict]):
+def render_preview_table(preview: Dict[str, Any]):
     """Renderiza tabela com preview das renomeações"""
     
     st.subheader("📋 Arquivos que serão processados:")
@@ -105,70 +145,60 @@ def render_preview_table(preview_data: List[Dict]):
     with col2:
         show_errors = st.checkbox("❌ Mostrar com erros", value=True)
     
-    # Filtrar dados
-    filtered_data = []
-    for item in preview_data:
-        if (item['status'] == 'ready' and show_ready) or (item['status'] == 'error' and show_errors):
-            filtered_data.append(item)
+    # Filtrar dados: cada combinação de filtros corresponde a uma lista já separada
+    if show_ready and show_errors:
+        filtered_data = preview['all']
+    elif show_ready:
+        filtered_data = preview['ready']
+    elif show_errors:
+        filtered_data = preview['errors']
+    else:
+        filtered_data = []
     
     if not filtered_data:
         st.info("Nenhum arquivo para mostrar com os filtros selecionados.")
         return
     
-    # Renderizar cards de preview
-    for i, item in enumerate(filtered_data):
-        render_preview_card(item, i)
+    # Uma única tabela, independente da quantidade de arquivos
+    rows = [
+        {
+            'status': "✅" if item['status'] == 'ready' else "❌",
+            'original_name': item['original_name'],
+            'new_name': item['new_name'],
+            'title_extracted': item.get('title_extracted', ''),
+            'content_preview': item.get('content_preview', ''),
+            'error': item['error']
+        }
+        for item in filtered_data
+    ]
+    
+    st.dataframe(
+        rows,
+        use_container_width=True,
+        hide_index=True,
+        height=min(500, 38 + 35 * len(rows)),
+        column_config={
+            'status': st.column_config.TextColumn("Status", width="small"),
+            'original_name': st.column_config.TextColumn("Nome Original"),
+            'new_name': st.column_config.TextColumn("Novo Nome"),
+            'title_extracted': st.column_config.TextColumn("Título Extraído"),
+            'content_preview': st.column_config.TextColumn("Preview do Conteúdo"),
+            'error': st.column_config.TextColumn("Erro")
+        }
+    )
+    
+    # Detalhes completos apenas para os arquivos com erro
+    error_items = preview['errors'] if show_errors else []
+    if error_items:
+        with st.expander(f"❌ Detalhes dos erros ({len(error_items)})"):
+            st.markdown('\n'.join(
+                f"- **{item['original_name']}**: {item['error']}" for item in error_items
+            ))
 
-def render_preview_card(item: Dict, index: int):
-    """Renderiza um card de preview individual"""
-    
-    # Definir cor baseada no status
-    if item['status'] == 'ready':
-        border_color = "#28a745"  # Verde
-        status_icon = "✅"
-    else:
-        border_color = "#dc3545"  # Vermelho
-        status_icon = "❌"
-    
-    with st.container():
-        st.markdown(f"""
-        <div style="
-            border: 2px solid {border_color};
-            border-radius: 10px;
-            padding: 15px;
-            margin: 10px 0;
-            background-color: #f8f9fa;
-        ">
-            <h5 style="color:#000">{status_icon} Arquivo {index + 1}</h5>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        col1, col2 = st.columns([1, 1])
-        
-        with col1:
-            st.write("**Nome Original:**")
-            st.code(item['original_name'])
-            
-            if item['status'] == 'ready':
-                st.write("**Título Extraído:**")
-                st.write(f"_{item.get('title_extracted', 'N/A')}_")
-        
-        with col2:
-            if item['status'] == 'ready':
-                st.write("**Novo Nome:**")
-                st.code(item['new_name'])
-                
-                if item.get('content_preview'):
-                    st.write("**Preview do Conteúdo:**")
-                    st.caption(item['content_preview'])
-            else:
-                st.write("**Erro:**")
-                st.error(item['error'])
-
-def render_action_buttons(preview_data: List[Dict], directory_path: str):
+def render_action_buttons(preview: Dict[str, Any], directory_path: str):
     """Renderiza botões de ação para o preview"""
     
-    ready_files = [p for p in preview_data if p['status'] == 'ready']
+    ready_files = preview['ready']
     
     if not ready_files:
         st.warning("Nenhum arquivo pronto para renomeação.")
@@ -184,13 +214,11 @@ def render_action_buttons(preview_data: List[Dict], directory_path: str):
             type="primary",
             use_container_width=True
         ):
-            execute_renaming(preview_data, directory_path)
+            execute_renaming(preview, directory_path)
 
-def execute_renaming(preview_data: List[Dict], directory_path: str):
+def execute_renaming(preview: Dict[str, Any], directory_path: str):
     """Executa a renomeação com barra de progresso"""
     
-    ready_files = [p for p in preview_data if p['status'] == 'ready']
-    
     st.subheader("🔄 Executando Renomeação...")
     
     # Barra de progresso
@@ -203,25 +231,27 @@ def execute_renaming(preview_data: List[Dict], directory_path: str):
     
     try:
         # Executar renomeação
-        status_text.text("Iniciando processamento...")
-        progress_bar.progress(10)
-        
-        renamer = FileRenamer(directory_path)
-        
         status_text.text("Executando renomeações...")
-        progress_bar.progress(30)
         
-        result = renamer.execute_rename(preview_data)
+        renamer = _get_renamer(directory_path)
+        
+        # Progresso real, atualizado só quando o percentual muda
+        last_percent = [0]
         
-        progress_bar.progress(90)
-        status_text.text("Finalizando...")
+        def update_progress(done: int, total: int):
+            percent = done * 100 // total if total else 100
+            if percent != last_percent[0]:
+                last_percent[0] = percent
+                progress_bar.progress(percent, text=f"Renomeando... {done}/{total}")
         
-        # Simular um pequeno delay para mostrar progresso
-        time.sleep(0.5)
+        result = renamer.execute_rename(preview['all'], on_progress=update_progress)
         
         progress_bar.progress(100)
         status_text.text("✅ Processamento concluído!")
         
+        # Renomeações em subpastas não alteram o mtime da pasta raiz
+        st.cache_data.clear()
+        
         # Mostrar resultados
         render_execution_results(result)
         
@@ -267,13 +297,27 @@ def render_execution_results(result: Dict):
     if result['successful'] > 0:
         st.info(f"💡 **ID da Operação**: `{result['operation_id']}`\n\nGuarde este ID para reverter a operação se necessário.")
 
+def _sorted_operations(directory_path: str, operations: List[Dict]) -> List[Dict]:
+    """
+    Operações da mais recente para a mais antiga; a ordenação só é refeita
+    quando o histórico muda (quantidade de operações ou a última registrada)
+    """
+    cache_key = (directory_path, len(operations), operations[-1]['timestamp'] if operations else '')
+    cached = st.session_state.get('_sorted_operations')
+    
+    if cached is None or cached[0] != cache_key:
+        cached = (cache_key, sorted(operations, key=lambda x: x['timestamp'], reverse=True))
+        st.session_state['_sorted_operations'] = cached
+    
+    return cached[1]
+
 def render_history_section(directory_path: str):
     """Renderiza seção de histórico de operações"""
     
     st.divider()
     st.subheader("📜 Histórico de Operações")
     
-    renamer = FileRenamer(directory_path)
+    renamer = _get_renamer(directory_path)
     history = renamer.get_history()
     
     if not history.get('operations'):
@@ -281,7 +325,7 @@ def render_history_section(directory_path: str):
         return
     
     # Mostrar operações mais recentes primeiro
-    operations = sorted(history['operations'], key=lambda x: x['timestamp'], reverse=True)
+    operations = _sorted_operations(directory_path, history['operations'])
     
     for i, operation in enumerate(operations[:10]):  # Mostrar últimas 10 operações
         with st.expander(f"Operação {i+1} - {operation['timestamp'][:19]}"):
@@ -302,6 +346,9 @@ def render_history_section(directory_path: str):
                 if st.button(f"🔄 Reverter Operação", key=f"revert_{operation['operation_id']}"):
                     with st.spinner("Revertendo operação..."):
                         revert_result = renamer.revert_operation(operation['operation_id'])
+                        st.cache_data.clear()
+                        # Os caminhos do preview não valem mais depois da reversão
+                        st.session_state.preview_data = None
                         
                         if revert_result['success']:
                             st.success(f"✅ {revert_result['reverted_count']} arquivo(s) revertido(s)")
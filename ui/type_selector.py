@@ -63,7 +63,8 @@ def render_type_checkbox(file_type: str, data: Dict, selected_types: List[str]):
         selected_types.append(file_type)
     
     # Informações adicionais abaixo do checkbox
-    st.caption(f"{count} arquivo{'s' if count != 1 else ''} • {', '.join(extensions)}")
+    partial = '+' if data.get('truncated') else ''  # Contagem parcial (diretório muito grande)
+    st.caption(f"{count}{partial} arquivo{'s' if count != 1 else ''} • {', '.join(extensions)}")
 
 def render_selection_summary(file_analysis: Dict, selected_types: List[str]):
     """Renderiza o resumo da seleção atual"""
@@ -73,16 +74,19 @@ def render_selection_summary(file_analysis: Dict, selected_types: List[str]):
     
     total_files_to_process = 0
     types_info = []
+    any_partial = False
     
     for file_type in selected_types:
         if file_type in file_analysis['file_types']:
             data = file_analysis['file_types'][file_type]
             count = data['count']
             total_files_to_process += count
+            any_partial = any_partial or data.get('truncated', False)
             types_info.append({
                 'icon': data['icon'],
                 'name': data['friendly_name'],
-                'count': count
+                'count': count,
+                'partial': '+' if data.get('truncated') else ''
             })
     
     # Métricas da seleção
@@ -92,7 +96,7 @@ def render_selection_summary(file_analysis: Dict, selected_types: List[str]):
         st.metric("Tipos Selecionados", len(selected_types))
     
     with col2:
-        st.metric("Arquivos a Processar", total_files_to_process)
+        st.metric("Arquivos a Processar", f"{total_files_to_process}+" if any_partial else total_files_to_process)
     
     with col3:
         percentage = (total_files_to_process / file_analysis['supported_files'] * 100) if file_analysis['supported_files'] > 0 else 0
@@ -102,7 +106,7 @@ def render_selection_summary(file_analysis: Dict, selected_types: List[str]):
     if types_info:
         st.write("**Tipos que serão processados:**")
         for info in types_info:
-            st.write(f"• {info['icon']} {info['name']}: {info['count']} arquivo{'s' if info['count'] != 1 else ''}")
+            st.write(f"• {info['icon']} {info['name']}: {info['count']}{info['partial']} arquivo{'s' if info['count'] != 1 else ''}")
 
 def render_process_button(selected_types: List[str]) -> bool:
     """